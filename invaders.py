@@ -16,14 +16,87 @@ Imports the the game demo and executes the main function.
 """
 
 
+import argparse
 import sys
 import game
 
 
+def seed(text):
+    """argparse type for a seed that fits the 64 bits a replay holds."""
+    value = int(text)
+    if not 0 <= value < 2**64:
+        raise argparse.ArgumentTypeError(f"{text} is not between 0 and 2**64 - 1")
+    return value
+
+
 def main():
     """main function."""
-    videogame = game.MyVideoGame()
-    videogame.run()
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument(
+        "--headless",
+        type=int,
+        metavar="FRAMES",
+        help="simulate FRAMES updates without a display or audio and report the speed",
+    )
+    parser.add_argument(
+        "--leaderboard",
+        choices=sorted(game.leaderboard.backends),
+        default="pickle",
+        help="where to keep the saved scores (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="CSV",
+        help="write the time each phase of the last frames took to CSV on exit",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="write the frames that ran over budget to a binary trace FILE on exit",
+    )
+    parser.add_argument(
+        "--seed",
+        type=seed,
+        help="seed the enemies' random fire with SEED instead of a random one",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="record the game's inputs to FILE on exit, for --replay",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="replay the inputs recorded in FILE without a display or audio",
+    )
+    args = parser.parse_args()
+    if args.replay:
+        videogame = game.MyVideoGame(
+            headless=True,
+            leaderboard_backend=args.leaderboard,
+            profile_csv=args.profile,
+            trace_file=args.trace,
+        )
+        videogame.run_replay(args.replay)
+    elif args.headless:
+        videogame = game.MyVideoGame(
+            headless=True,
+            leaderboard_backend=args.leaderboard,
+            profile_csv=args.profile,
+            trace_file=args.trace,
+            seed=args.seed,
+            record_file=args.record,
+        )
+        videogame.run_headless(args.headless)
+    else:
+        videogame = game.MyVideoGame(
+            leaderboard_backend=args.leaderboard,
+            profile_csv=args.profile,
+            trace_file=args.trace,
+            seed=args.seed,
+            record_file=args.record,
+        )
+        videogame.run()
 
 
 if __name__ == "__main__":
@@ -21,4 +21,9 @@ __all__ = [
     "animation",
     "assets",
     "objects",
+    "spatial",
+    "leaderboard",
+    "fonts",
+    "profiler",
+    "replay",
 ]
@@ -20,6 +20,45 @@ import pygame
 import assets
 
 
+# Converted frames keyed by (asset key, transform). Once an animation's
+# frames are here, playing it again never touches the disk.
+_frame_cache = {}
+
+
+def _apply(surface, transform):
+    """Return surface with a transform such as ("flip", True, True) applied."""
+    name, *args = transform
+    if name == "flip":
+        return pygame.transform.flip(surface, *args)
+    if name == "scale":
+        return pygame.transform.scale(surface, args)
+    if name == "rotate":
+        return pygame.transform.rotate(surface, *args)
+    raise ValueError(f'Unknown transform "{name}"')
+
+
+def get_frame(key, transform=None):
+    """
+    Return the animation frame for the asset key with transform applied,
+    loading and converting it the first time it is asked for.
+    """
+    frame = _frame_cache.get((key, transform))
+    if frame is None:
+        if transform is None:
+            # Held for good: the cache keeps the frame alive anyway.
+            frame = assets.manager.acquire(key)
+        else:
+            frame = _apply(get_frame(key), transform)
+        _frame_cache[(key, transform)] = frame
+    return frame
+
+
+def preload(frames):
+    """Load a sequence of (key, transform) frames into the cache."""
+    for (key, transform) in frames:
+        get_frame(key, transform)
+
+
 # Adapted aliens.py in pygame/examples
 # https://github.com/pygame/pygame/blob/main/examples/aliens.py
 
@@ -29,20 +68,11 @@ class Explosion(pygame.sprite.Sprite):
 
     defaultlife = 12
     animcycle = 3
-    images = []
+    frames = (("explosion2", None), ("explosion2", ("flip", True, True)))
 
     def __init__(self, actor):
         pygame.sprite.Sprite.__init__(self, self.containers)
-        try:
-            surface = pygame.image.load(assets.get("explosion2"))
-        except pygame.error as pygame_error:
-            raise SystemExit(
-                f'Could not load image "{assets.get("explosion2")}"'
-                + f" {pygame.get_error()}"
-            ) from pygame_error
-        img = surface.convert()
-        if not Explosion.images:
-            Explosion.images = [img, pygame.transform.flip(img, 1, 1)]
+        self.images = [get_frame(key, transform) for (key, transform) in Explosion.frames]
         self.image = self.images[0]
         self.rect = self.image.get_rect(center=actor.rect.center)
         self.life = Explosion.defaultlife
@@ -14,7 +14,11 @@
 """Assets to create PyGame based games."""
 
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import io
 import os
+import pygame
 
 main_dir = os.path.dirname(__file__)
 data_dir = os.path.join(main_dir, "data")
@@ -37,3 +41,166 @@ def get(key):
     if key_path:
         key_path = os.path.join(data_dir, key_path)
     return key_path
+
+
+class AssetManager:
+    """
+    Loads images, sounds and music once and shares them between users.
+    Assets are keyed by their asset_dict key (or a path) and reference
+    counted; when the loaded assets outgrow the memory budget, the least
+    recently used ones that nobody holds are evicted. Assets can also be
+    prefetched: read and decoded on a worker thread ahead of their first use.
+    """
+
+    def __init__(self, budget=32 * 1024 * 1024):
+        """Initialize an empty manager with a budget in bytes"""
+        self._budget = budget
+        # (kind, key) -> asset, least recently used first
+        self._assets = OrderedDict()
+        self._sizes = {}
+        self._refcounts = {}
+        self._used = 0
+        self._executor = None
+        # (kind, key) -> Future of the decoded, not yet converted, asset
+        self._pending = {}
+
+    @property
+    def budget(self):
+        """Return the memory budget in bytes."""
+        return self._budget
+
+    @budget.setter
+    def budget(self, val):
+        """Set the memory budget in bytes, evicting to fit."""
+        self._budget = val
+        self._evict()
+
+    @property
+    def used(self):
+        """Return the estimated bytes held by loaded assets."""
+        return self._used
+
+    def image(self, key):
+        """Return the surface for key, converted to the display's format."""
+        return self._get("image", key)
+
+    def sound(self, key):
+        """Return the pygame.mixer.Sound for key."""
+        return self._get("sound", key)
+
+    def music(self, key):
+        """Return a file object for key that pygame.mixer.music can load."""
+        return io.BytesIO(self._get("music", key))
+
+    def acquire(self, key, kind="image"):
+        """Return the asset for key and keep it loaded until released."""
+        asset = getattr(self, kind)(key)
+        self._refcounts[(kind, key)] += 1
+        return asset
+
+    def release(self, key, kind="image"):
+        """Drop a reference taken with acquire."""
+        self._refcounts[(kind, key)] -= 1
+        self._evict()
+
+    def prefetch(self, keys):
+        """
+        Start decoding the (key, kind) pairs in keys on a worker thread.
+        The first request for each asset then only waits for whatever
+        decoding is left and, for images, converts it on the calling thread.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="prefetch"
+            )
+        for (key, kind) in keys:
+            if (kind, key) not in self._assets and (kind, key) not in self._pending:
+                self._pending[(kind, key)] = self._executor.submit(
+                    self._read, kind, key
+                )
+
+    def shutdown(self):
+        """Stop the prefetch worker, abandoning anything not yet started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+    def _get(self, kind, key):
+        """Return a cached asset, loading it if needed, and mark it used."""
+        asset = self._assets.get((kind, key))
+        if asset is None:
+            asset = self._load(kind, key)
+            self._assets[(kind, key)] = asset
+            self._sizes[(kind, key)] = self._size(kind, asset)
+            self._refcounts[(kind, key)] = 0
+            self._used += self._sizes[(kind, key)]
+            # The asset is returned, and may be acquired, even if it does
+            # not fit the budget on its own.
+            self._evict(keep=(kind, key))
+        else:
+            self._assets.move_to_end((kind, key))
+        return asset
+
+    def _load(self, kind, key):
+        """Return the asset, from the prefetcher if it was asked for."""
+        future = self._pending.pop((kind, key), None)
+        asset = future.result() if future else self._read(kind, key)
+        if kind == "image":
+            asset = self._convert(asset)
+        return asset
+
+    @staticmethod
+    def _read(kind, key):
+        """Read and decode the asset from disk; safe on a worker thread."""
+        filename = get(key) or key
+        try:
+            if kind == "music":
+                with open(filename, "rb") as opened:
+                    return opened.read()
+            if kind == "sound":
+                return pygame.mixer.Sound(filename)
+            return pygame.image.load(filename)
+        except (pygame.error, OSError) as load_error:
+            raise SystemExit(
+                f'Unable to open "{filename}" {pygame.get_error()}'
+            ) from load_error
+
+    @staticmethod
+    def _convert(surface):
+        """Convert a surface to the display's pixel format, if there is one."""
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @staticmethod
+    def _size(kind, asset):
+        """Estimate the bytes an asset occupies."""
+        if kind == "music":
+            return len(asset)
+        if kind == "sound":
+            mixer = pygame.mixer.get_init()
+            if mixer is None:
+                # With the mixer off a sound's length cannot be read.
+                return 0
+            frequency, size, channels = mixer
+            return int(asset.get_length() * frequency * channels * abs(size) // 8)
+        return asset.get_width() * asset.get_height() * asset.get_bytesize()
+
+    def _evict(self, keep=None):
+        """
+        Drop unreferenced assets other than keep, least recently used
+        first, until within budget.
+        """
+        for asset_key in list(self._assets):
+            if self._used <= self._budget:
+                break
+            if self._refcounts[asset_key] == 0 and asset_key != keep:
+                del self._assets[asset_key]
+                del self._refcounts[asset_key]
+                self._used -= self._sizes.pop(asset_key)
+
+
+manager = AssetManager()
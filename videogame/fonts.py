@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Darren Cruz
+# CPSC 386-02
+# 2023-04-19
+# darrencruz@csu.fullerton.edu
+# @darrenjcruz
+#
+# Lab 05-00
+#
+# This is the fonts module that contains the shared fonts.
+#
+
+
+"""Fonts and rendered text shared by every scene."""
+
+from collections import OrderedDict
+import pygame
+
+
+# Loaded fonts keyed by (face, size); a face of None is the default font.
+_fonts = {}
+
+# Rendered text keyed by (text, font, color, antialias), least recently
+# used first; at most text_cache_size surfaces are kept.
+_texts = OrderedDict()
+text_cache_size = 256
+
+
+def get(size, face=None):
+    """
+    Return the font face at size, loading it the first time it is asked
+    for. Scenes share the returned Font, so it must not be changed with
+    set_bold and the like.
+    """
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(face or pygame.font.get_default_font(), size)
+        _fonts[key] = font
+    return font
+
+
+def render(font, text, antialias, color):
+    """
+    Return font.render(text, antialias, color), rendering it only if it is
+    not cached. The surface is shared, so it must not be drawn on.
+    """
+    key = (text, font, tuple(color), antialias)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        return surface
+    surface = font.render(text, antialias, color)
+    _texts[key] = surface
+    if len(_texts) > text_cache_size:
+        _texts.popitem(last=False)
+    return surface
+
+
+def clear():
+    """Forget the fonts and text, which pygame.quit() leaves unusable."""
+    _texts.clear()
+    _fonts.clear()
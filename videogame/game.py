@@ -14,14 +14,21 @@
 """Game objects to create PyGame based games."""
 
 
+from collections import deque
 import os
+import random
+import time
 import warnings
 
 import pygame
 
-import rgbcolors
-from scene import SceneManager, MenuScene, GameScene, HowToPlayScene, LeaderboardScene, LoseScene, WinScene, EnterInitialsScene
 import assets
+import fonts
+import leaderboard
+import rgbcolors
+from profiler import FrameProfiler, HitchDetector
+from replay import InputRecorder, read_replay
+from scene import Scene, SceneManager, MenuScene, GameScene, HowToPlayScene, LeaderboardScene, LoseScene, WinScene, EnterInitialsScene
 
 
 def display_info():
@@ -45,14 +52,24 @@ class VideoGame:
         window_width=800,
         window_height=800,
         window_title="My Awesome Game",
+        frame_rate=None,
+        headless=False,
     ):
         """
         Initializes a new game with the given window size and
-        window title.
+        window title. When frame_rate is given it caps rendering for
+        every scene; the simulation keeps running at each scene's tick rate.
+        A headless game uses SDL's dummy video and audio drivers so it can
+        run where there is no display or sound card.
         """
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        Scene.headless = headless
         pygame.init()
         self._window_size = (window_width, window_height)
         self._clock = pygame.time.Clock()
+        self._frame_rate = frame_rate
         self._screen = pygame.display.set_mode(self._window_size)
         self._title = window_title
         pygame.display.set_caption(self._title)
@@ -80,12 +97,47 @@ class VideoGame:
 class MyVideoGame(VideoGame):
     """Show a colored window with a colored message and a polygon."""
 
-    def __init__(self):
-        """Init the Pygame demo."""
-        super().__init__(800, 800, "Space Invaders")
+    # Most simulation steps run per rendered frame before time is dropped.
+    max_steps_per_frame = 5
+
+    # Frames changing more than this fraction of the window, or more rects
+    # than max_dirty_rects, update the whole display at once.
+    max_dirty_fraction = 0.5
+    max_dirty_rects = 256
+
+    def __init__(
+        self,
+        frame_rate=None,
+        headless=False,
+        leaderboard_backend="pickle",
+        profile_csv=None,
+        trace_file=None,
+        seed=None,
+        record_file=None,
+    ):
+        """
+        Init the Pygame demo. The frames' phase times are written to
+        profile_csv, and the frames that ran over budget to trace_file,
+        if given, when the game ends. The game scene's random numbers are
+        seeded with seed, or a random one, and its inputs are recorded to
+        record_file, if given, for run_replay. The seed is taken modulo
+        2 ** 64.
+        """
+        super().__init__(800, 800, "Space Invaders", frame_rate, headless)
+        self._profiler = FrameProfiler()
+        self._profile_csv = profile_csv
+        # The detector hooks audit events and the collector, so it is only
+        # built when its trace is wanted.
+        self._hitches = HitchDetector(self._profiler) if trace_file else None
+        self._trace_file = trace_file
+        # Replay files hold the seed in 64 bits.
+        self._seed = random.getrandbits(32) if seed is None else seed % 2**64
+        self._record_file = record_file
+        self._recorder = None
+        leaderboard.store = leaderboard.open_leaderboard(leaderboard_backend)
         self._main_dir = os.path.dirname(__file__)
         self._data_dir = os.path.join(self._main_dir, "data")
-        self._soundtrack = assets.get("soundtrack2")
+        self._soundtrack = "soundtrack2"
         self._score = 0
         self._lives = 3
         self._next_life = 0
@@ -93,6 +145,10 @@ class MyVideoGame(VideoGame):
         self._restart = False
         self._scene_graph = SceneManager(self._score, self._lives, self._next_life)
         self.build_scene_graph()
+        if record_file:
+            game_scene = self._scene_graph.get('1')
+            self._recorder = InputRecorder(self._seed, game_scene.tick_rate())
+            game_scene.recorder = self._recorder
 
     def build_scene_graph(self):
         """Build scene graph for the game demo."""
@@ -108,6 +164,7 @@ class MyVideoGame(VideoGame):
             scene_manager=self._scene_graph,
             soundtrack=self._soundtrack,
             score=0, lives=3, next_life=0,
+            seed=self._seed,
         )
         HowToPlay = HowToPlayScene(
             screen=self._screen,
@@ -156,30 +213,229 @@ class MyVideoGame(VideoGame):
         """Run the game; the main game loop."""
         scene_iterator = iter(self.scene_graph)
         current_scene = next(scene_iterator)
+        profiler = self._profiler
+        hitches = self._hitches
         while not self._game_is_over:
-            current_scene.start_scene()
+            # Set before start_scene, which may start a new round over them.
             current_scene._score = self._score
             current_scene._lives = self._lives
             current_scene._next_life = self._next_life
             current_scene._continue_game = self._continue_game
             current_scene._restart = self._restart
+            current_scene.start_scene()
+            profiler.lap("start_scene")
+            # Fixed timestep: the scene is simulated in steps of
+            # 1000 / tick_rate() ms and drawn as often as the frame rate
+            # allows, interpolating between the last two steps.
+            accumulator = 0
+            self._clock.tick()
             while current_scene.is_valid():
-                current_scene.delta_time = self._clock.tick(current_scene.frame_rate())
+                step = 1000 / current_scene.tick_rate()
+                accumulator += self._clock.tick(
+                    self._frame_rate or current_scene.frame_rate()
+                )
+                accumulator = min(accumulator, step * self.max_steps_per_frame)
+                profiler.begin_frame()
+                if hitches is not None:
+                    hitches.check(current_scene)
                 for event in pygame.event.get():
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        profiler.overlay = not profiler.overlay
                     current_scene.process_event(event)
-                current_scene.update_scene()
+                profiler.lap("events")
+                while accumulator >= step and current_scene.is_valid():
+                    current_scene.delta_time = step
+                    current_scene.update_scene()
+                    accumulator -= step
+                profiler.lap("update_scene")
+                current_scene.interpolation = min(accumulator / step, 1.0)
                 current_scene.draw()
+                profiler.lap("draw")
                 current_scene.render_updates()
+                # The overlay is marked so the scene erases it next frame.
+                current_scene.mark(profiler.draw(self._screen))
+                profiler.lap("render_updates")
                 self._score = current_scene._scene_manager._score
                 self._lives = current_scene._scene_manager._lives
                 self._next_life = current_scene._scene_manager._next_life
                 self._continue_game = current_scene._scene_manager._continue_game
                 self._restart = current_scene._scene_manager._restart
-                pygame.display.update()
+                self.update_display(current_scene.dirty_rects())
+                profiler.lap("display.update")
             current_scene.end_scene()
             try:
                 current_scene = next(scene_iterator)
             except StopIteration:
                 self._game_is_over = True
+        profiler.begin_frame()
+        if hitches is not None:
+            hitches.check(current_scene)
+        self.save_profile()
+        self.save_recording()
+        leaderboard.store.close()
+        assets.manager.shutdown()
+        fonts.clear()
+        pygame.quit()
+        return 0
+
+    def save_profile(self):
+        """Write the frame timings and hitches to their files, if any."""
+        if self._profile_csv:
+            rows = self._profiler.dump_csv(self._profile_csv)
+            print(
+                f"Wrote the last {rows} of {self._profiler.frames} frame timings"
+                f" to {self._profile_csv}"
+            )
+        if self._hitches is not None:
+            self._hitches.save(self._trace_file)
+            print(f"Wrote {len(self._hitches.hitches)} hitches to {self._trace_file}")
+            self._hitches.close()
+
+    def save_recording(self):
+        """Write the game scene's recorded inputs to their file, if any."""
+        if self._recorder is not None:
+            self._recorder.save(self._record_file)
+            print(
+                f"Recorded {self._recorder.events} inputs with seed "
+                + f"{self._seed} to {self._record_file}"
+            )
+
+    def update_display(self, rects):
+        """Update the rects of the display that changed; None for all of it."""
+        if rects is not None and len(rects) <= self.max_dirty_rects:
+            area = sum(rect.width * rect.height for rect in rects)
+            (width, height) = self._screen.get_size()
+            if area <= self.max_dirty_fraction * width * height:
+                pygame.display.update(rects)
+                return
+        pygame.display.update()
+
+    def run_headless(self, ticks=100000):
+        """
+        Simulate rounds of the game scene without drawing for the given
+        number of updates, as fast as possible, restarting the round
+        whenever it is won or lost. Returns the simulated frames per second.
+        """
+        game_scene = self._scene_graph._scene_dict['1']
+        self._scene_graph._restart = True
+        game_scene.start_scene()
+        step = 1000 / game_scene.tick_rate()
+        rounds = 0
+        start = time.perf_counter()
+        profiler = self._profiler
+        hitches = self._hitches
+        for _ in range(ticks):
+            profiler.begin_frame()
+            if hitches is not None:
+                hitches.check(game_scene)
+            for event in pygame.event.get():
+                game_scene.process_event(event)
+            profiler.lap("events")
+            if not game_scene.is_valid():
+                rounds += 1
+                game_scene.end_scene()
+                self._scene_graph._restart = True
+                game_scene.start_scene()
+                profiler.lap("start_scene")
+            game_scene.delta_time = step
+            game_scene.update_scene()
+            profiler.lap("update_scene")
+        profiler.begin_frame()
+        if hitches is not None:
+            hitches.check(game_scene)
+        elapsed = time.perf_counter() - start
+        game_scene.end_scene()
+        self.save_profile()
+        self.save_recording()
+        assets.manager.shutdown()
+        fonts.clear()
         pygame.quit()
-        return 0
\ No newline at end of file
+        simulated_fps = ticks / elapsed
+        print(
+            f"Simulated {ticks} frames ({rounds} rounds finished) in "
+            + f"{elapsed:.2f}s: {simulated_fps:.0f} frames per second, "
+            + f"{simulated_fps / game_scene.tick_rate():.1f}x real time. "
+            + f"Peak bullets in play: {game_scene.bullets.high_water}"
+            + f"/{game_scene.bullets.capacity}."
+        )
+        return simulated_fps
+
+    def run_replay(self, filename):
+        """
+        Replay the game scene's inputs recorded in filename without
+        drawing, as fast as possible. Each visit to the scene is started
+        as it was and run for as many updates, with every recorded event
+        processed after the same update, and its score is checked against
+        the recorded one, as is a checksum of its final state where the
+        recording holds one. Returns the simulated frames per second.
+        """
+        replay = read_replay(filename)
+        game_scene = self._scene_graph.get('1')
+        if replay.tick_rate != game_scene.tick_rate():
+            raise ValueError(
+                f"{filename} was recorded at {replay.tick_rate} ticks per "
+                + f"second, not {game_scene.tick_rate()}"
+            )
+        game_scene.seed = replay.seed
+        manager = self._scene_graph
+        step = 1000 / replay.tick_rate
+        ticks = 0
+        diverged = 0
+        start = time.perf_counter()
+        profiler = self._profiler
+        hitches = self._hitches
+        for (number, visit) in enumerate(replay.visits, 1):
+            manager._continue_game = visit.continue_game
+            manager._restart = visit.restart
+            game_scene._score = manager._score
+            game_scene._lives = manager._lives
+            game_scene._next_life = manager._next_life
+            game_scene.start_scene()
+            profiler.lap("start_scene")
+            events = deque(visit.events)
+            for tick in range(visit.ticks + 1):
+                profiler.begin_frame()
+                if hitches is not None:
+                    hitches.check(game_scene)
+                # The events the scene posts itself were recorded too.
+                pygame.event.clear()
+                while events and events[0][0] == tick:
+                    game_scene.process_event(events.popleft()[1])
+                profiler.lap("events")
+                if tick == visit.ticks:
+                    break
+                game_scene.delta_time = step
+                game_scene.update_scene()
+                profiler.lap("update_scene")
+            ticks += visit.ticks
+            checksum = game_scene.checksum()
+            game_scene.end_scene()
+            if game_scene._score != visit.score:
+                diverged += 1
+                warnings.warn(
+                    f"Visit {number} of the replay ended with a score of "
+                    + f"{game_scene._score}, not {visit.score}",
+                    RuntimeWarning,
+                )
+            elif visit.checksum is not None and checksum != visit.checksum:
+                diverged += 1
+                warnings.warn(
+                    f"Visit {number} of the replay ended in a different state "
+                    + f"than recorded: checksum {checksum:08x}, not {visit.checksum:08x}",
+                    RuntimeWarning,
+                )
+        profiler.begin_frame()
+        if hitches is not None:
+            hitches.check(game_scene)
+        elapsed = time.perf_counter() - start
+        self.save_profile()
+        assets.manager.shutdown()
+        fonts.clear()
+        pygame.quit()
+        simulated_fps = ticks / elapsed if elapsed else 0
+        print(
+            f"Replayed {ticks} frames of {len(replay.visits)} visits with seed "
+            + f"{replay.seed} in {elapsed:.2f}s: {simulated_fps:.0f} frames per "
+            + f"second, {diverged} visits diverged from the recording."
+        )
+        return simulated_fps
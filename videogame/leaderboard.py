@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# Darren Cruz
+# CPSC 386-02
+# 2023-04-19
+# darrencruz@csu.fullerton.edu
+# @darrenjcruz
+#
+# Lab 05-00
+#
+# This is the leaderboard module that contains the saved scores.
+#
+
+
+"""The leaderboard of saved scores."""
+
+from collections import namedtuple
+import atexit
+import bisect
+import datetime
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import warnings
+import zlib
+
+
+#Score namedtuple for leaderboard; date is a time.time() timestamp and
+#stage the number of the wave the player reached
+Score = namedtuple(
+    "Score", ["score", "initials", "date", "stage"], defaults=(None, None)
+)
+
+#pickle_file
+main_dir = os.path.dirname(__file__)
+data_dir = os.path.join(main_dir, "data")
+pickle_file = os.path.join(data_dir, "leaderboard.pkl")
+sqlite_file = os.path.join(data_dir, "leaderboard.db")
+
+# The journal starts with a magic number followed by fixed-size records,
+# each ending in a CRC32 of the rest of the record. SCJ1 records hold
+# score, initials and date; SCJ2 records add the stage.
+JOURNAL_MAGIC = b"SCJ2"
+journal_records = {
+    b"SCJ1": struct.Struct("<i3sdI"),
+    b"SCJ2": struct.Struct("<i3sdhI"),
+}
+
+
+def encode_score(score):
+    """Return the SCJ2 journal record for a Score."""
+    record = journal_records[JOURNAL_MAGIC]
+    fields = (
+        score.score,
+        score.initials.encode("ascii", "replace")[:3],
+        score.date,
+        score.stage or 0,
+    )
+    crc = zlib.crc32(record.pack(*fields, 0)[:-4])
+    return record.pack(*fields, crc)
+
+
+def decode_scores(data, magic=JOURNAL_MAGIC):
+    """
+    Return the Scores in journal data written in the format named by
+    magic, stopping at the first record that was torn or corrupted by a
+    crash mid-write.
+    """
+    record = journal_records[magic]
+    scores = []
+    for offset in range(0, len(data) - record.size + 1, record.size):
+        packed = data[offset : offset + record.size]
+        value, initials, date, *stage, crc = record.unpack(packed)
+        if zlib.crc32(packed[:-4]) != crc:
+            break
+        scores.append(Score(value, initials.decode("ascii"), date, *stage))
+    return scores
+
+
+def period_start(period):
+    """Return the timestamp the current "day" or "week" (from Monday) began."""
+    today = datetime.datetime.combine(datetime.date.today(), datetime.time())
+    if period == "day":
+        return today.timestamp()
+    if period == "week":
+        return (today - datetime.timedelta(days=today.weekday())).timestamp()
+    raise ValueError(f'Unknown period "{period}"')
+
+
+class _ScoreUnpickler(pickle.Unpickler):
+    """Unpickler that reads snapshots written when Score lived in scene."""
+
+    def find_class(self, module, name):
+        """Map scene.Score to Score without importing scene."""
+        if (module, name) == ("scene", "Score"):
+            return Score
+        return super().find_class(module, name)
+
+
+class Leaderboard:
+    """
+    The saved scores, read once and kept sorted best first in memory. The
+    files are only read again when their modification times change. New
+    scores are inserted in place with bisect, so adding a score or finding
+    the rank of one never sorts the board again.
+
+    Scores live in two files: a pickled snapshot of the best scores and an
+    append-only journal of scores added since. Saving a score appends one
+    fixed-size record to the journal, so it costs the same however many
+    games have been played. Once the journal holds compact_after records
+    it is compacted: the best keep scores are written to a new snapshot
+    and the journal starts over. Writes happen behind, on a writer thread,
+    so the caller never waits on the disk.
+    """
+
+    def __init__(self, filename, size=10, keep=100, compact_after=64):
+        """Initialize the leaderboard for filename, showing size scores"""
+        self._filename = filename
+        self._journal = os.path.splitext(filename)[0] + ".journal"
+        self._size = size
+        self._keep = keep
+        self._compact_after = compact_after
+        self._scores = []
+        # The negated score of each entry of _scores, ascending for bisect.
+        self._keys = []
+        # What _version returned when the scores were last read; None
+        # until they have been read once.
+        self._version_seen = None
+        self._journal_length = 0
+        self._unsaved = []
+        # Guards the scores handed to the writer and the writer's state.
+        self._lock = threading.Condition()
+        self._unwritten = []
+        self._writing = False
+        self._closing = False
+        self._writer = None
+        atexit.register(self.close)
+
+    def _version(self):
+        """Return the files' modification times; None for a missing file."""
+        mtimes = []
+        for filename in (self._filename, self._journal):
+            try:
+                mtimes.append(os.stat(filename).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _journal_magic(self):
+        """Return the journal's magic number, or None if it is empty."""
+        try:
+            with open(self._journal, "rb") as opened:
+                return opened.read(len(JOURNAL_MAGIC)) or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        """Return the scores in the snapshot and the journal."""
+        scores = []
+        if os.path.exists(self._filename):
+            with open(self._filename, "rb") as opened:
+                scores = _ScoreUnpickler(opened).load()
+        journaled = []
+        magic = self._journal_magic()
+        if magic in journal_records:
+            with open(self._journal, "rb") as opened:
+                opened.seek(len(magic))
+                journaled = decode_scores(opened.read(), magic)
+        self._journal_length = len(journaled)
+        # A crash between writing a snapshot and emptying the journal
+        # leaves scores in both; each score appears once.
+        return list(dict.fromkeys(scores + journaled))
+
+    def refresh(self):
+        """Read the scores again if they changed since they were last read."""
+        with self._lock:
+            # Scores not yet on disk are newer than anything stored.
+            if self._unsaved or self._unwritten or self._writing:
+                return
+            version = self._version()
+            if version == self._version_seen:
+                return
+            self._version_seen = version
+            self._scores = self._load()
+            self._scores.sort(key=lambda x: x.score, reverse=True)
+            del self._scores[self._keep :]
+            self._keys = [-score.score for score in self._scores]
+
+    def top(self, count=None, period=None):
+        """
+        Return the best count scores, by default as many as are shown,
+        optionally only those of the current "day" or "week".
+        """
+        scores = self._scores
+        if period is not None:
+            since = period_start(period)
+            scores = [score for score in scores if (score.date or 0) >= since]
+        return scores[: count or self._size]
+
+    def rank(self, value):
+        """
+        Return the competition rank of a score of value: one more than the
+        number of better scores, so equal scores share a rank.
+        """
+        return 1 + bisect.bisect_left(self._keys, -value)
+
+    def add(self, score):
+        """Add a Score, dating it if needed; it is written on the next flush."""
+        # Compaction writes out _scores, so they must hold the saved ones.
+        if self._version_seen is None:
+            self.refresh()
+        if score.date is None:
+            score = score._replace(date=time.time())
+        # After any equal scores, as the earlier of two ties is listed
+        # first; rank() gives them all the same competition rank.
+        index = bisect.bisect_right(self._keys, -score.score)
+        if index < self._keep:
+            self._scores.insert(index, score)
+            self._keys.insert(index, -score.score)
+            del self._scores[self._keep :]
+            del self._keys[self._keep :]
+        self._unsaved.append(score)
+
+    def flush(self):
+        """Have the writer thread save the scores added since the last flush."""
+        with self._lock:
+            if not self._unsaved:
+                return
+            self._unwritten.extend(self._unsaved)
+            self._unsaved = []
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_behind, name="leaderboard", daemon=True
+                )
+                self._writer.start()
+            self._lock.notify_all()
+
+    def close(self):
+        """Save any unsaved scores and wait for the writer thread to stop."""
+        self.flush()
+        with self._lock:
+            writer = self._writer
+            self._closing = True
+            self._lock.notify_all()
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            self._writer = None
+            self._closing = False
+
+    def _write_behind(self):
+        """Writer thread: save each batch of scores handed over until closed."""
+        while True:
+            with self._lock:
+                while not self._unwritten and not self._closing:
+                    self._lock.wait()
+                if not self._unwritten:
+                    return
+                scores, self._unwritten = self._unwritten, []
+                self._writing = True
+            try:
+                self._persist(scores)
+            except (OSError, sqlite3.Error) as save_error:
+                # The scores are kept in memory and tried again on the
+                # next flush; the writer carries on.
+                warnings.warn(
+                    f"Unable to save scores to {self._filename}: {save_error}",
+                    RuntimeWarning,
+                )
+                with self._lock:
+                    self._unsaved[:0] = scores
+            else:
+                with self._lock:
+                    self._version_seen = self._version()
+            finally:
+                with self._lock:
+                    self._writing = False
+
+    def _persist(self, scores):
+        """Journal scores, compacting first if needed; runs on the writer."""
+        full = self._journal_length >= self._compact_after
+        outdated = self._journal_magic() not in (None, JOURNAL_MAGIC)
+        if full or outdated:
+            # A full journal, or one in an older format, becomes a snapshot.
+            with self._lock:
+                best = list(self._scores)
+            self._compact(best)
+        with open(self._journal, "ab") as opened:
+            if opened.tell() == 0:
+                opened.write(JOURNAL_MAGIC)
+            else:
+                # Cut off a record torn by a crash or a failed write, so
+                # the new records line up and are read back.
+                record = journal_records[JOURNAL_MAGIC]
+                opened.truncate(len(JOURNAL_MAGIC) + self._journal_length * record.size)
+            opened.write(b"".join(encode_score(score) for score in scores))
+            opened.flush()
+            os.fsync(opened.fileno())
+        self._journal_length += len(scores)
+
+    def _compact(self, scores):
+        """Make scores the snapshot and start an empty journal."""
+        self._replace(self._filename, pickle.dumps(scores, pickle.HIGHEST_PROTOCOL))
+        self._replace(self._journal, JOURNAL_MAGIC)
+        self._journal_length = 0
+
+    @staticmethod
+    def _replace(filename, data):
+        """Write data to a temporary file and rename it over filename."""
+        directory = os.path.dirname(filename) or "."
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as opened:
+                opened.write(data)
+                opened.flush()
+                os.fsync(opened.fileno())
+            os.replace(temporary, filename)
+        except OSError:
+            os.unlink(temporary)
+            raise
+
+    def __len__(self):
+        """Return the number of scores kept."""
+        return len(self._scores)
+
+
+class SQLiteLeaderboard(Leaderboard):
+    """
+    The saved scores kept in an SQLite database, for cabinets with too
+    many games behind them to hold in a pickle. Every score is kept;
+    indexes on score and date answer top-K and per-period queries without
+    reading the whole table. A tally of how many games ended on each score
+    answers rank queries, so their cost grows with the number of distinct
+    scores rather than the number of games. The best keep scores are also
+    cached in memory so drawing the leaderboard never queries the database.
+    """
+
+    def __init__(self, filename, size=10, keep=100):
+        """Initialize the leaderboard for the database filename"""
+        super().__init__(filename, size, keep)
+        # The main thread and the writer thread each get a connection.
+        self._connections = threading.local()
+
+    def _connection(self):
+        """Return this thread's connection, creating the schema if needed."""
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._filename)
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS scores (
+                    id INTEGER PRIMARY KEY,
+                    score INTEGER NOT NULL,
+                    initials TEXT NOT NULL,
+                    date REAL NOT NULL,
+                    stage INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score);
+                CREATE INDEX IF NOT EXISTS scores_by_date ON scores (date, score);
+                BEGIN IMMEDIATE;
+                CREATE TABLE IF NOT EXISTS score_counts (
+                    score INTEGER PRIMARY KEY,
+                    count INTEGER NOT NULL
+                );
+                CREATE TRIGGER IF NOT EXISTS count_score AFTER INSERT ON scores
+                BEGIN
+                    INSERT INTO score_counts (score, count) VALUES (NEW.score, 1)
+                    ON CONFLICT (score) DO UPDATE SET count = count + 1;
+                END;
+                -- Databases written before the tally existed are counted once.
+                INSERT INTO score_counts (score, count)
+                SELECT score, COUNT(*) FROM scores
+                WHERE NOT EXISTS (SELECT 1 FROM score_counts)
+                GROUP BY score;
+                COMMIT;
+                """
+            )
+            self._connections.connection = connection
+        return connection
+
+    def _version(self):
+        """Return the id of the newest score; rows are only ever added."""
+        query = self._connection().execute("SELECT MAX(id) FROM scores")
+        (newest,) = query.fetchone()
+        return newest or 0
+
+    def _load(self):
+        """Return the best keep scores."""
+        rows = self._connection().execute(
+            "SELECT score, initials, date, stage FROM scores"
+            " ORDER BY score DESC LIMIT ?",
+            (self._keep,),
+        )
+        return [Score(*row) for row in rows]
+
+    def top(self, count=None, period=None):
+        """
+        Return the best count scores, by default as many as are shown,
+        optionally only those of the current "day" or "week".
+        """
+        if period is None:
+            return super().top(count)
+        rows = self._connection().execute(
+            "SELECT score, initials, date, stage FROM scores WHERE date >= ?"
+            " ORDER BY score DESC LIMIT ?",
+            (period_start(period), count or self._size),
+        )
+        return [Score(*row) for row in rows]
+
+    def rank(self, value):
+        """Return the competition rank of a score of value, as Leaderboard.rank."""
+        (better,) = self._connection().execute(
+            "SELECT TOTAL(count) FROM score_counts WHERE score > ?", (value,)
+        ).fetchone()
+        return int(better) + 1
+
+    def _persist(self, scores):
+        """Insert scores in one transaction; runs on the writer."""
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT INTO scores (score, initials, date, stage)"
+                " VALUES (?, ?, ?, ?)",
+                scores,
+            )
+
+    def __len__(self):
+        """Return the number of scores in the database."""
+        query = self._connection().execute("SELECT TOTAL(count) FROM score_counts")
+        (count,) = query.fetchone()
+        return int(count)
+
+
+backends = {
+    "pickle": lambda: Leaderboard(pickle_file),
+    "sqlite": lambda: SQLiteLeaderboard(sqlite_file),
+}
+
+
+def open_leaderboard(backend="pickle"):
+    """Return a leaderboard kept by backend, one of the keys of backends."""
+    return backends[backend]()
+
+
+store = open_leaderboard()
@@ -14,25 +14,20 @@
 """Using assets to create objects."""
 
 
-from itertools import cycle
+from itertools import cycle, repeat
 from random import randint
-import math
+import numpy as np
 import rgbcolors
 import pygame
 import assets
+import spatial
 
 
 def load_sprite_sheet(filename, img_dim_x, img_dim_y, num_images, colorkey=None):
     """Loads a sprite sheet"""
     # Limitation: only considers a 1D strip of images where the images
     # are tiled from left to right
-    try:
-        sheet = pygame.image.load(filename)
-    except pygame.error as pygame_error:
-        print("\n".join(pygame_error.args))
-        raise SystemExit(
-            f'Unable to open "{filename}" {pygame.get_error()}'
-        ) from pygame_error
+    sheet = assets.manager.image(filename)
     rects = [
         pygame.Rect(0 + (img_dim_x * n), 0, img_dim_x, img_dim_y)
         for n in range(num_images)
@@ -52,8 +47,8 @@ def load_sprite_sheet(filename, img_dim_x, img_dim_y, num_images, colorkey=None)
 # Taken from the pygame examples
 def load_image(filename, colorkey=None, scale=1):
     """Loads an image"""
-    image = pygame.image.load(filename)
-    image = image.convert()
+    # The cached surface is shared; scaling makes a copy this sprite owns.
+    image = assets.manager.image(filename)
 
     size = image.get_size()
     size = (size[0] * scale, size[1] * scale)
@@ -158,17 +153,23 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, position):
         """Initialize the Player object"""
         pygame.sprite.Sprite.__init__(self)
-        self.image, self.rect = load_image(assets.get("player"), -1)
+        self.image, self.rect = load_image("player", -1)
         self._position = position
+        self._previous_position = pygame.math.Vector2(position)
         self.rect.center = self._position
         self._velocity = pygame.math.Vector2(0, 0)
 
     def update(self):
         """Update the player."""
+        self._previous_position = self._position
         v = self._position.x + self._velocity.x
         if v > 0 and v < 800:
             self._position = self._position + self._velocity
-            self.rect.center = self._position
+        self.rect.center = self._position
+
+    def interpolate(self, alpha):
+        """Place the sprite between its last two positions for drawing."""
+        self.rect.center = self._previous_position.lerp(self._position, alpha)
 
     @property
     def position(self):
@@ -181,100 +182,193 @@ class Player(pygame.sprite.Sprite):
 
     def move_left(self):
         """Moves the player left."""
-        self._velocity = pygame.math.Vector2(-5, 0)
+        self._velocity = pygame.math.Vector2(-10, 0)
 
     def move_right(self):
         """Moves the player right."""
-        self._velocity = pygame.math.Vector2(5, 0)
+        self._velocity = pygame.math.Vector2(10, 0)
 
 
-class Enemy:
-    """Class respresenting the Enemy with a bounding rect."""
+class Formation:
+    """
+    Class representing a block of enemies that march in lockstep. The
+    enemies' centers live in one array so the whole formation moves with a
+    single array operation.
+    """
 
-    def __init__(self, center_x, center_y, color, name="None"):
-        """Initialize the Enemy object"""
-        self._center_x = center_x
-        self._center_y = center_y
+    half_width = 16
+
+    def __init__(self, centers, color=rgbcolors.maroon, names=None):
+        """Initialize the Formation from a sequence of (x, y) centers"""
+        self._positions = np.array(centers, dtype=float).reshape(-1, 2)
+        self._previous_positions = self._positions.copy()
+        self._alive = np.ones(len(self._positions), dtype=bool)
         self._color = color
-        self._name = name
-        self._is_exploding = False
-        self._position = pygame.math.Vector2(center_x, center_y)
-        self._velocity = pygame.math.Vector2(0, 0)
-        self._center_x = self._position.x
-        self._center_y = self._position.y
-        self._speed = 0.01
-        self._top_left_vertice = ((self._center_x - 16), (self._center_y - 16))
-        self._top_right_vertice = ((self._center_x + 16), (self._center_y - 16))
-        self._bottom_vertice = ((self._center_x), (self._center_y + 16))
-        self._directions = ["right", "down", "left", "down"]
-        self._directions_iterator = cycle(self._directions)
-        self._direction = next(self._directions_iterator)
+        if names is None:
+            names = ["None"] * len(self._positions)
+        self._enemies = [Enemy(self, i, name) for (i, name) in enumerate(names)]
+        # (direction, pixels to travel before turning) for each leg of the march
+        self._legs = cycle(
+            [
+                (np.array([1.0, 0.0]), 176),
+                (np.array([0.0, 1.0]), 52),
+                (np.array([-1.0, 0.0]), 176),
+                (np.array([0.0, 1.0]), 52),
+            ]
+        )
+        self._direction, self._leg_length = next(self._legs)
         self._pixels_counter = 0
         self._move_amount = 1
+        self._glyph = None
 
     def update(self):
-        """Update the player."""
-        if self._direction == "right":
-            self.position.x += self._move_amount
-            self._pixels_counter += 1
-            self.rect.center = self._position
-            self._center_x = self._position.x
-            self._center_y = self._position.y
-            self._top_left_vertice = ((self._center_x - 16), (self._center_y - 16))
-            self._top_right_vertice = ((self._center_x + 16), (self._center_y - 16))
-            self._bottom_vertice = ((self._center_x), (self._center_y + 16))
-            if self._pixels_counter > 176:
-                self._pixels_counter = 0
-                self._direction = next(self._directions_iterator)
-        elif self._direction == "left":
-            self._position.x += self._move_amount * -1
-            self._pixels_counter += 1
-            self.rect.center = self._position
-            self._center_x = self._position.x
-            self._center_y = self._position.y
-            self._top_left_vertice = ((self._center_x - 16), (self._center_y - 16))
-            self._top_right_vertice = ((self._center_x + 16), (self._center_y - 16))
-            self._bottom_vertice = ((self._center_x), (self._center_y + 16))
-            if self._pixels_counter > 176:
-                self._pixels_counter = 0
-                self._direction = next(self._directions_iterator)
-        else:
-            self.position.y += self._move_amount
-            self._pixels_counter += 1
-            self.rect.center = self._position
-            self._center_x = self._position.x
-            self._center_y = self._position.y
-            self._top_left_vertice = ((self._center_x - 16), (self._center_y - 16))
-            self._top_right_vertice = ((self._center_x + 16), (self._center_y - 16))
-            self._bottom_vertice = ((self._center_x), (self._center_y + 16))
-            if self._pixels_counter > 52:
-                self._pixels_counter = 0
-                self._direction = next(self._directions_iterator)
+        """Move every enemy one step along the current leg of the march."""
+        self._previous_positions[:] = self._positions
+        self._positions += self._direction * self._move_amount
+        self._pixels_counter += 1
+        if self._pixels_counter > self._leg_length:
+            self._pixels_counter = 0
+            self._direction, self._leg_length = next(self._legs)
+
+    def tobytes(self):
+        """Return the positions of the enemies and which are alive, as bytes."""
+        return self._positions.tobytes() + self._alive.tobytes()
+
+    @property
+    def positions(self):
+        """Return the array of enemy centers."""
+        return self._positions
+
+    @property
+    def color(self):
+        """Return the enemies' color."""
+        return self._color
+
+    @property
+    def glyph(self):
+        """Return the enemies' triangle, rasterized once to be blitted."""
+        if self._glyph is None:
+            half = Formation.half_width
+            key = tuple(255 - channel for channel in pygame.Color(self._color)[:3])
+            glyph = pygame.Surface((2 * half + 1, 2 * half + 1))
+            glyph.fill(key)
+            pygame.draw.polygon(
+                glyph, self._color, [(0, 0), (2 * half, 0), (half, 2 * half)]
+            )
+            glyph.set_colorkey(key, pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                glyph = glyph.convert()
+            self._glyph = glyph
+        return self._glyph
+
+    def is_alive(self, index):
+        """Return true if the enemy at index has not been killed."""
+        return bool(self._alive[index])
+
+    def kill(self, enemy):
+        """Remove an enemy from the formation."""
+        self._alive[enemy.index] = False
+
+    def choice(self, rng):
+        """Return a random live enemy using the random.Random rng."""
+        return self._enemies[rng.choice(np.flatnonzero(self._alive))]
+
+    def _alive_indices(self, mask):
+        """Return the enemies where mask is true and that are still alive."""
+        return [self._enemies[i] for i in np.flatnonzero(mask & self._alive)]
+
+    def colliding(self, rect):
+        """Return the live enemies whose bounding rects overlap rect."""
+        half = Formation.half_width
+        x = self._positions[:, 0]
+        y = self._positions[:, 1]
+        overlap = (
+            (x - half < rect.right)
+            & (x + half > rect.left)
+            & (y - half < rect.bottom)
+            & (y + half > rect.top)
+        )
+        return self._alive_indices(overlap)
+
+    def boxes(self):
+        """
+        Return the live enemies and an array of their bounding boxes as rows
+        of (left, top, right, bottom).
+        """
+        indices = np.flatnonzero(self._alive)
+        centers = self._positions[indices]
+        half = Formation.half_width
+        boxes = np.hstack((centers - half, centers + half))
+        return [self._enemies[i] for i in indices], boxes
+
+    def below(self, y):
+        """Return the live enemies whose centers are lower than y."""
+        return self._alive_indices(self._positions[:, 1] > y)
+
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the live enemies, alpha of the way into their last move, and
+        return the rects drawn.
+        """
+        previous = self._previous_positions[self._alive]
+        centers = previous + (self._positions[self._alive] - previous) * alpha
+        # Flooring the corner puts the glyph on the pixels the polygon
+        # would have covered.
+        corners = np.floor(centers - Formation.half_width).astype(int)
+        return screen.blits(zip(repeat(self.glyph), corners.tolist()))
+
+    def __getitem__(self, index):
+        """Return the enemy at index."""
+        return self._enemies[index]
+
+    def __iter__(self):
+        """Iterate over the live enemies."""
+        return iter(self._alive_indices(True))
+
+    def __len__(self):
+        """Return the number of live enemies."""
+        return int(np.count_nonzero(self._alive))
+
+
+class Enemy:
+    """Class respresenting one Enemy of a Formation with a bounding rect."""
+
+    __slots__ = ("_formation", "_index", "_name", "is_exploding")
+
+    def __init__(self, formation, index, name="None"):
+        """Initialize the Enemy object as a view of its formation"""
+        self._formation = formation
+        self._index = index
+        self._name = name
+        self.is_exploding = False
+
+    @property
+    def index(self):
+        """Return the Enemy's index in its formation"""
+        return self._index
 
     @property
     def position(self):
         """Return the Enemy's position"""
-        return self._position
+        return pygame.math.Vector2(*self._formation.positions[self._index])
 
     @property
     def rect(self):
         """Return boudning rect."""
-        left = self._position.x - 16
-        top = self._position.y - 16
-        width = 32
+        left, top = self._formation.positions[self._index] - Formation.half_width
+        width = 2 * Formation.half_width
         return pygame.Rect(left, top, width, width)
 
     def draw(self, screen):
         """Draws the enemy to the screen"""
-        pygame.draw.polygon(
-            screen,
-            rgbcolors.maroon,
-            [self._top_left_vertice, self._top_right_vertice, self._bottom_vertice],
-        )
+        center = self._formation.positions[self._index]
+        corner = np.floor(center - Formation.half_width)
+        return screen.blit(self._formation.glyph, corner.tolist())
 
     def __repr__(self):
         """Enemy stringify"""
-        return f'Enemy({self._position.x}, {self._position.y}, {self._color}, "{self._name}")'
+        x, y = self._formation.positions[self._index]
+        return f'Enemy({x}, {y}, {self._formation.color}, "{self._name}")'
 
 
 # To fix to use with sprites
@@ -311,37 +405,173 @@ class Enemy:
 #         self.rect.center = self._position
 
 
-class Bullet:
-    """Class representing a Bullet"""
-
-    def __init__(self, position, target_position, speed, color=rgbcolors.light_cyan):
-        """Initialize the Bullet"""
-        self._position = pygame.math.Vector2(position)
-        self._target_position = pygame.math.Vector2(target_position)
-        self._speed = speed
-        self._color = color
-        self._radius = 5
+class BulletSystem:
+    """
+    Class representing every bullet in play as rows of NumPy arrays, so
+    bullets are moved, retired and collided in batches rather than one at
+    a time. Live bullets are packed into the first count rows.
+    """
+
+    radius = 5
+    PLAYER = 0
+    ENEMY = 1
+    # Past this many bullet-enemy pairs only the pairs sharing a grid cell
+    # are tested; below it testing every pair at once is cheaper.
+    broadphase_pairs = 20000
+
+    def __init__(self, capacity=1024):
+        """Preallocate room for capacity bullets"""
+        self._capacity = capacity
+        self._count = 0
+        self._high_water = 0
+        self._positions = np.zeros((capacity, 2))
+        self._previous_positions = np.zeros((capacity, 2))
+        self._targets = np.zeros((capacity, 2))
+        self._speeds = np.zeros(capacity)
+        self._colors = np.zeros((capacity, 3), dtype=np.uint8)
+        self._owners = np.zeros(capacity, dtype=np.int8)
+
+    def fire(self, position, target_position, speed, owner=PLAYER, color=rgbcolors.light_cyan):
+        """Add a bullet; returns False and drops the shot when full."""
+        if self._count == self._capacity:
+            return False
+        i = self._count
+        self._positions[i] = position
+        self._previous_positions[i] = position
+        self._targets[i] = target_position
+        self._speeds[i] = speed
+        self._colors[i] = color
+        self._owners[i] = owner
+        self._count += 1
+        self._high_water = max(self._high_water, self._count)
+        return True
+
+    def clear(self):
+        """Remove every bullet."""
+        self._count = 0
+
+    def count(self, owner=None):
+        """Return the number of bullets in play, optionally for one owner."""
+        if owner is None:
+            return self._count
+        return int(np.count_nonzero(self._owners[: self._count] == owner))
 
     @property
-    def rect(self):
-        """Return bounding rect."""
-        left = self._position.x - self._radius
-        top = self._position.y - self._radius
-        width = 2 * self._radius
-        return pygame.Rect(left, top, width, width)
+    def capacity(self):
+        """Return the most bullets that can be in play."""
+        return self._capacity
 
-    def should_die(self):
-        """Check if the bullet should die."""
-        squared_distance = (self._position - self._target_position).length_squared()
-        return math.isclose(squared_distance, 0.0, rel_tol=1e-01)
+    def tobytes(self):
+        """Return the positions, targets and owners of the bullets, as bytes."""
+        n = self._count
+        arrays = (self._positions, self._targets, self._owners)
+        return b"".join(array[:n].tobytes() for array in arrays)
 
-    def update(self, delta_time):
-        """Update the bullet"""
-        self._position.move_towards_ip(self._target_position, self._speed * delta_time)
+    @property
+    def high_water(self):
+        """Return the most bullets that have been in play at once."""
+        return self._high_water
 
-    def draw(self, screen):
-        """Draw the circle to screen."""
-        pygame.draw.circle(screen, self._color, self._position, self._radius)
+    @property
+    def occupancy(self):
+        """Return the fraction of the capacity in play."""
+        return self._count / self._capacity
+
+    def _boxes(self):
+        """Return the bullets' bounding rects as rows of (left, top, right, bottom)."""
+        corners = np.floor(self._positions[: self._count] - BulletSystem.radius)
+        return np.hstack((corners, corners + 2 * BulletSystem.radius))
+
+    def _hits(self, boxes):
+        """
+        Return an array, one row per bullet and one column per box, that is
+        true where the bullet's bounding rect overlaps the box. Boxes are
+        rows of (left, top, right, bottom).
+        """
+        bullets = self._boxes()[:, :, np.newaxis]
+        return (
+            (bullets[:, 0] < boxes[:, 2])
+            & (bullets[:, 2] > boxes[:, 0])
+            & (bullets[:, 1] < boxes[:, 3])
+            & (bullets[:, 3] > boxes[:, 1])
+        )
+
+    def update(self, delta_time, barricade_boxes, enemy_boxes, player_rect):
+        """
+        Move every bullet toward its target, then retire the bullets that
+        arrived, hit a barricade, or hit an opponent. Player bullets hit
+        enemy_boxes, each enemy stopping at most one bullet; enemy bullets hit
+        the player. Returns the columns of enemy_boxes that were hit and the
+        number of bullets that hit the player.
+        """
+        n = self._count
+        if n == 0:
+            return [], 0
+        positions = self._positions[:n]
+        targets = self._targets[:n]
+        self._previous_positions[:n] = positions
+        offsets = targets - positions
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        steps = self._speeds[:n] * delta_time
+        arrived = distances <= steps
+        scale = steps / np.where(arrived, 1.0, distances)
+        positions += offsets * scale[:, np.newaxis]
+        positions[arrived] = targets[arrived]
+
+        dead = arrived.copy()
+        if len(barricade_boxes):
+            dead |= self._hits(barricade_boxes).any(axis=1)
+
+        hit_enemies = []
+        players = (self._owners[:n] == BulletSystem.PLAYER) & ~dead
+        if len(enemy_boxes) and players.any():
+            bullets = np.flatnonzero(players)
+            if len(bullets) * len(enemy_boxes) > BulletSystem.broadphase_pairs:
+                rows, columns = spatial.overlaps(self._boxes()[bullets], enemy_boxes)
+            else:
+                rows, columns = np.nonzero(self._hits(enemy_boxes)[bullets])
+            # a bullet takes the first enemy it overlaps and an enemy is
+            # taken by the first bullet to reach it; pairs come sorted by
+            # bullet and then enemy
+            shooters, first = np.unique(rows, return_index=True)
+            hit_enemies, taken = np.unique(columns[first], return_index=True)
+            dead[bullets[shooters[taken]]] = True
+            hit_enemies = hit_enemies.tolist()
+
+        enemies = (self._owners[:n] == BulletSystem.ENEMY) & ~dead
+        player_box = np.array(
+            [[player_rect.left, player_rect.top, player_rect.right, player_rect.bottom]]
+        )
+        player_hits = self._hits(player_box)[:, 0] & enemies
+        dead |= player_hits
+
+        if dead.any():
+            keep = ~dead
+            alive = int(np.count_nonzero(keep))
+            for array in (
+                self._positions,
+                self._previous_positions,
+                self._targets,
+                self._speeds,
+                self._colors,
+                self._owners,
+            ):
+                array[:alive] = array[:n][keep]
+            self._count = alive
+        return hit_enemies, int(np.count_nonzero(player_hits))
+
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the bullets, alpha of the way into their last move, and return
+        the rects drawn.
+        """
+        n = self._count
+        previous = self._previous_positions[:n]
+        centers = previous + (self._positions[:n] - previous) * alpha
+        return [
+            pygame.draw.circle(screen, color, center, BulletSystem.radius)
+            for (center, color) in zip(centers.tolist(), self._colors[:n].tolist())
+        ]
 
 
 class Barricade:
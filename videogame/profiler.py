@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# Darren Cruz
+# CPSC 386-02
+# 2023-04-19
+# darrencruz@csu.fullerton.edu
+# @darrenjcruz
+#
+# Lab 05-00
+#
+# This is the profiler module that times the phases of each frame.
+#
+
+
+"""Per-frame timing of the main loop."""
+
+from collections import namedtuple
+import csv
+import gc
+import struct
+import sys
+import time
+import numpy as np
+import pygame
+import fonts
+import rgbcolors
+
+
+class FrameProfiler:
+    """
+    Times each phase of the last window frames of the main loop and
+    reports rolling percentiles of them, as an overlay or as CSV.
+
+    The loop calls begin_frame() before its first phase and lap(phase)
+    as each phase ends; the phase times of a frame are stored when the
+    next frame begins. Times are in milliseconds.
+    """
+
+    # start_scene covers ending one scene and starting the next, and is
+    # counted in the frame during which the scene changed.
+    phases = (
+        "events",
+        "update_scene",
+        "draw",
+        "render_updates",
+        "display.update",
+        "start_scene",
+    )
+    # Every row also records the sum of the phases and the whole frame,
+    # including the time spent waiting on the clock.
+    columns = phases + ("busy", "total")
+    percentiles = (50, 95, 99)
+    # Frames between refreshes of the overlay's text.
+    overlay_period = 30
+
+    def __init__(self, window=600):
+        """Initialize the profiler to keep the last window frames"""
+        self._window = window
+        self._times = np.zeros((window, len(self.columns)))
+        self._frames = 0
+        self._current = np.zeros(len(self.columns))
+        self._index = {phase: i for (i, phase) in enumerate(self.columns)}
+        self._frame_start = None
+        self._lap_start = None
+        self._overlay = False
+        self._overlay_surface = None
+
+    def begin_frame(self):
+        """Store the frame just finished and start timing a new one."""
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            current = self._current
+            current[-2] = current[:-2].sum()
+            current[-1] = (now - self._frame_start) * 1000
+            self._times[self._frames % self._window] = current
+            self._frames += 1
+            current[:] = 0
+        self._frame_start = now
+        self._lap_start = now
+
+    def lap(self, phase):
+        """Add the time since the last lap, or the frame's start, to phase."""
+        if self._lap_start is None:
+            return
+        now = time.perf_counter()
+        self._current[self._index[phase]] += (now - self._lap_start) * 1000
+        self._lap_start = now
+
+    @property
+    def frames(self):
+        """Return the number of frames timed."""
+        return self._frames
+
+    def last(self):
+        """Return the times of the frame stored last, keyed by column."""
+        return dict(zip(self.columns, self.last_row().tolist()))
+
+    def last_row(self):
+        """Return the times of the frame stored last, in column order."""
+        return self._times[(self._frames - 1) % self._window]
+
+    def _recent(self):
+        """Return the stored frames, oldest first."""
+        if self._frames < self._window:
+            return self._times[: self._frames]
+        return np.roll(self._times, -(self._frames % self._window), axis=0)
+
+    def stats(self):
+        """
+        Return {column: (p50, p95, p99)} over the stored frames, or an
+        empty dict before the first frame is stored.
+        """
+        recent = self._recent()
+        if not len(recent):
+            return {}
+        table = np.percentile(recent, self.percentiles, axis=0)
+        return {
+            column: tuple(table[:, i].tolist())
+            for (i, column) in enumerate(self.columns)
+        }
+
+    def dump_csv(self, filename):
+        """
+        Write the stored frames to filename, one row per frame, and return
+        the number of rows written.
+        """
+        recent = self._recent()
+        first = self._frames - len(recent)
+        with open(filename, "w", newline="", encoding="utf-8") as opened:
+            writer = csv.writer(opened)
+            writer.writerow(("frame",) + self.columns)
+            for (i, row) in enumerate(recent.tolist(), first):
+                writer.writerow([i] + [f"{ms:.3f}" for ms in row])
+        return len(recent)
+
+    @property
+    def overlay(self):
+        """Is the overlay shown?"""
+        return self._overlay
+
+    @overlay.setter
+    def overlay(self, val):
+        """overlay setter"""
+        self._overlay = val
+        self._overlay_surface = None
+
+    def draw(self, screen):
+        """
+        Draw the percentiles in the top left corner of screen, if the
+        overlay is shown, and return the rects drawn.
+        """
+        if not self._overlay:
+            return []
+        stale = self._frames % self.overlay_period == 0
+        if self._overlay_surface is None or stale:
+            self._overlay_surface = self._render_overlay()
+        return [screen.blit(self._overlay_surface, (0, 0))]
+
+    def _render_overlay(self):
+        """Render the table of percentiles onto a surface of its own."""
+        font = fonts.get(16)
+        rows = [("phase",) + tuple(f"p{p}" for p in self.percentiles)]
+        for (column, values) in self.stats().items():
+            rows.append((column,) + tuple(f"{ms:.2f}" for ms in values))
+        # Numbers are right-aligned, as the default font is proportional.
+        (label_width, value_width) = (135, 55)
+        line_height = font.get_linesize()
+        width = label_width + value_width * len(self.percentiles) + 10
+        overlay = pygame.Surface((width, line_height * len(rows) + 10))
+        overlay.fill(rgbcolors.black)
+        for (i, row) in enumerate(rows):
+            y = 5 + i * line_height
+            (label, *values) = row
+            text = font.render(label, True, rgbcolors.light_green)
+            overlay.blit(text, (5, y))
+            for (j, value) in enumerate(values, 1):
+                text = font.render(value, True, rgbcolors.light_green)
+                right = label_width + value_width * j
+                overlay.blit(text, (right - text.get_width(), y))
+        return overlay
+
+
+# A frame that ran over budget: the scene, the phase that took longest, the
+# time of every FrameProfiler column, and the garbage collections, change in
+# allocated memory blocks and files opened during the frame.
+Hitch = namedtuple(
+    "Hitch",
+    ["frame", "scene", "phase", "times", "collections", "blocks", "opens"],
+)
+Trace = namedtuple("Trace", ["budget", "columns", "hitches", "histogram"])
+
+# The trace file holds a header naming the columns, one fixed-size record
+# per hitch and the histogram of frame times in 1ms bins.
+TRACE_MAGIC = b"HTC1"
+trace_header = struct.Struct("<4sfBH")
+trace_counts = struct.Struct("<IH")
+
+
+def _hitch_record(columns):
+    """Return the struct of a hitch record holding columns times."""
+    return struct.Struct("<I" + "f" * len(columns) + "BHiH16s")
+
+
+_opens = 0
+
+
+def _count_opens(event, _args):
+    """Audit hook counting the files opened by any thread."""
+    global _opens
+    if event == "open":
+        _opens += 1
+
+
+class HitchDetector:
+    """
+    Watches the frames a FrameProfiler times for ones whose busy time
+    exceeds a budget, by default the frame time of the scene's frame rate,
+    and builds a histogram of every frame's total time.
+
+    The loop calls check() just after FrameProfiler.begin_frame(). Hitches
+    are kept in memory and written, with the histogram, by save(), so the
+    detector does no IO of its own during play.
+    """
+
+    # 1ms bins; the last bin counts every frame longer than that.
+    histogram_bins = 101
+    max_hitches = 10000
+    _hook_installed = False
+
+    def __init__(self, profiler, budget=None):
+        """Initialize the detector for profiler's frames, budget in ms"""
+        self._profiler = profiler
+        self._budget = budget
+        self._histogram = np.zeros(self.histogram_bins, dtype=np.uint32)
+        self._hitches = []
+        self._checked = profiler.frames
+        self._collections = 0
+        gc.callbacks.append(self._count_collection)
+        if not HitchDetector._hook_installed:
+            # Audit hooks cannot be removed, so one serves every detector.
+            sys.addaudithook(_count_opens)
+            HitchDetector._hook_installed = True
+        self._mark = self._counters()
+
+    def _count_collection(self, phase, _info):
+        """gc callback counting the collections started."""
+        if phase == "start":
+            self._collections += 1
+
+    def _counters(self):
+        """Return the running collection, block and open counts."""
+        return (self._collections, sys.getallocatedblocks(), _opens)
+
+    @property
+    def hitches(self):
+        """Return the hitches found so far."""
+        return self._hitches
+
+    def check(self, scene):
+        """Look at the frame the profiler just stored, played in scene."""
+        counters = self._counters()
+        (collections, blocks, opens) = (
+            now - before for (now, before) in zip(counters, self._mark)
+        )
+        self._mark = counters
+        if self._profiler.frames == self._checked:
+            return
+        self._checked = self._profiler.frames
+        (*_, busy, total) = self._profiler.last_row().tolist()
+        self._histogram[min(int(total), self.histogram_bins - 1)] += 1
+        budget = self._budget or 1000 / scene.frame_rate()
+        if busy <= budget or len(self._hitches) >= self.max_hitches:
+            return
+        times = self._profiler.last()
+        phase = max(FrameProfiler.phases, key=times.get)
+        self._hitches.append(
+            Hitch(
+                self._checked - 1,
+                type(scene).__name__,
+                phase,
+                times,
+                collections,
+                blocks,
+                opens,
+            )
+        )
+
+    def histogram(self):
+        """Return the count of frames in each 1ms bin of total frame time."""
+        return self._histogram.copy()
+
+    def save(self, filename):
+        """Write the hitches and the histogram to a binary trace file."""
+        columns = FrameProfiler.columns
+        names = "\0".join(columns).encode("ascii")
+        record = _hitch_record(columns)
+        with open(filename, "wb") as opened:
+            opened.write(
+                trace_header.pack(
+                    TRACE_MAGIC, self._budget or 0, len(columns), len(names)
+                )
+            )
+            opened.write(names)
+            opened.write(
+                trace_counts.pack(len(self._hitches), len(self._histogram))
+            )
+            for hitch in self._hitches:
+                opened.write(
+                    record.pack(
+                        hitch.frame,
+                        *(hitch.times[column] for column in columns),
+                        FrameProfiler.phases.index(hitch.phase),
+                        min(hitch.collections, 0xFFFF),
+                        hitch.blocks,
+                        min(hitch.opens, 0xFFFF),
+                        hitch.scene.encode("ascii")[:16],
+                    )
+                )
+            opened.write(self._histogram.astype("<u4").tobytes())
+
+    def close(self):
+        """Stop counting garbage collections."""
+        if self._count_collection in gc.callbacks:
+            gc.callbacks.remove(self._count_collection)
+
+
+def read_trace(filename):
+    """Read a trace file written by HitchDetector.save into a Trace."""
+    with open(filename, "rb") as opened:
+        data = opened.read()
+    (magic, budget, column_count, names_length) = trace_header.unpack_from(
+        data
+    )
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"{filename} is not a hitch trace")
+    offset = trace_header.size
+    columns = data[offset : offset + names_length].decode("ascii").split("\0")
+    offset += names_length
+    (hitch_count, bins) = trace_counts.unpack_from(data, offset)
+    offset += trace_counts.size
+    record = _hitch_record(columns)
+    phases = columns[: column_count - 2]
+    hitches = []
+    for _ in range(hitch_count):
+        (frame, *fields) = record.unpack_from(data, offset)
+        offset += record.size
+        times = dict(zip(columns, fields[:column_count]))
+        (phase, collections, blocks, opens, scene) = fields[column_count:]
+        hitches.append(
+            Hitch(
+                frame,
+                scene.rstrip(b"\0").decode("ascii"),
+                phases[phase],
+                times,
+                collections,
+                blocks,
+                opens,
+            )
+        )
+    histogram = np.frombuffer(data, dtype="<u4", count=bins, offset=offset)
+    return Trace(budget or None, tuple(columns), hitches, histogram.copy())
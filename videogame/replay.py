@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Darren Cruz
+# CPSC 386-02
+# 2023-04-19
+# darrencruz@csu.fullerton.edu
+# @darrenjcruz
+#
+# Lab 05-00
+#
+# This is the replay module that records and reads back game inputs.
+#
+
+
+"""Recording of the game scene's inputs, tick by tick, for replay."""
+
+from collections import namedtuple
+import struct
+import pygame
+
+
+# The replay file starts with a header holding the seed of the game
+# scene's random numbers and its tick rate, followed by fixed-size
+# records of (tick, type, value). An event record's type is the pygame
+# event type and its value the key, if any. Every visit to the scene is
+# framed by a VISIT_START record, whose value holds the restart and
+# continue flags, and a VISIT_END record, whose value is the score. Just
+# before VISIT_END, a VISIT_CHECKSUM record holds a CRC32 of the scene's
+# state when it ended.
+REPLAY_MAGIC = b"RPL1"
+replay_header = struct.Struct("<4sQH")
+replay_record = struct.Struct("<IHI")
+VISIT_START = pygame.NOEVENT
+VISIT_CHECKSUM = 0xFFFE
+VISIT_END = 0xFFFF
+CONTINUE_GAME = 1
+RESTART = 2
+
+Visit = namedtuple(
+    "Visit", ["continue_game", "restart", "ticks", "score", "checksum", "events"]
+)
+Replay = namedtuple("Replay", ["seed", "tick_rate", "visits"])
+
+
+def recorded(event):
+    """Is event one the game scene acts on, and so one to record?"""
+    if event.type in (pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT):
+        return True
+    return pygame.USEREVENT <= event.type < pygame.NUMEVENTS
+
+
+class InputRecorder:
+    """
+    Records the events the game scene processes, each with the number of
+    updates the scene had run when it processed it. Records are kept in
+    memory and written by save(), so recording does no IO during play.
+    """
+
+    def __init__(self, seed, tick_rate):
+        """Initialize the recorder for a scene seeded with seed, below 2 ** 64"""
+        self._data = bytearray(replay_header.pack(REPLAY_MAGIC, seed, tick_rate))
+        self._events = 0
+
+    @property
+    def events(self):
+        """Return the number of events recorded."""
+        return self._events
+
+    def start(self, continue_game, restart):
+        """Record that the scene started with the given flags."""
+        flags = (CONTINUE_GAME if continue_game else 0) | (RESTART if restart else 0)
+        self._data += replay_record.pack(0, VISIT_START, flags)
+
+    def end(self, tick, score, checksum):
+        """
+        Record that the scene ended after tick updates with score, in the
+        state whose CRC32 is checksum.
+        """
+        self._data += replay_record.pack(tick, VISIT_CHECKSUM, checksum)
+        self._data += replay_record.pack(tick, VISIT_END, score)
+
+    def record(self, tick, event):
+        """Record event, processed after tick updates, if the scene uses it."""
+        if recorded(event):
+            self._data += replay_record.pack(tick, event.type, getattr(event, "key", 0))
+            self._events += 1
+
+    def save(self, filename):
+        """Write the recording to filename."""
+        with open(filename, "wb") as opened:
+            opened.write(self._data)
+
+
+def read_replay(filename):
+    """
+    Read a file written by InputRecorder.save into a Replay whose visits
+    hold their events as (tick, pygame.event.Event) pairs. A visit the
+    recording stopped in the middle of is dropped.
+    """
+    with open(filename, "rb") as opened:
+        data = opened.read()
+    (magic, seed, tick_rate) = replay_header.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ValueError(f"{filename} is not a replay")
+    visits = []
+    flags = None
+    checksum = None
+    events = []
+    for (tick, kind, value) in replay_record.iter_unpack(data[replay_header.size :]):
+        if kind == VISIT_START:
+            (flags, checksum, events) = (value, None, [])
+        elif kind == VISIT_CHECKSUM:
+            checksum = value
+        elif kind == VISIT_END and flags is not None:
+            continue_game = bool(flags & CONTINUE_GAME)
+            restart = bool(flags & RESTART)
+            visits.append(
+                Visit(continue_game, restart, tick, value, checksum, events)
+            )
+            flags = None
+        elif kind in (pygame.KEYDOWN, pygame.KEYUP):
+            events.append((tick, pygame.event.Event(kind, key=value)))
+        else:
+            events.append((tick, pygame.event.Event(kind)))
+    return Replay(seed, tick_rate, visits)
@@ -13,16 +13,19 @@
 
 """Scene objects for making games with PyGame."""
 
-from collections import namedtuple
 import locale
-import os
-import pickle
+import struct
+import zlib
 import assets
+import fonts
 import random
+import numpy as np
 import pygame
 import rgbcolors
-from objects import Circle, Player, Enemy, Bullet, Barricade
-from animation import Explosion
+from objects import Circle, Player, Formation, BulletSystem, Barricade
+from animation import Explosion, preload
+import leaderboard
+from leaderboard import Score
 
 
 # NOTES
@@ -51,13 +54,6 @@ LOSE_Event = pygame.event.Event(LOSE)
 WIN = pygame.USEREVENT + 2
 WIN_Event = pygame.event.Event(WIN)
 
-#Score namedtuple for leaderboard
-Score = namedtuple("Score", ["score", "initials"])
-
-#pickle_file
-main_dir = os.path.dirname(__file__)
-data_dir = os.path.join(main_dir, "data")
-pickle_file = os.path.join(data_dir, "leaderboard.pkl")
 locale.setlocale(locale.LC_ALL, "en_US.UTF-8")
 
 
@@ -75,6 +71,8 @@ class SceneManager:
         self._next_life = next_life
         self._continue_game = False
         self._restart = False
+        # The wave being played, saved with the score.
+        self._stage = 1
 
     def set_next_scene(self, key):
         """Sets the next scene in the sequence"""
@@ -95,6 +93,10 @@ class SceneManager:
         """Default Iterator"""
         return self
     
+    def get(self, key):
+        """Returns the scene for key"""
+        return self._scene_dict[key]
+
     def __next__(self):
         """Next for Iterator"""
         if self._next_scene and self._reloaded:
@@ -104,22 +106,90 @@ class SceneManager:
             raise StopIteration
 
 
+class SilentSound:
+    """Stand-in for pygame.mixer.Sound when the game runs headless."""
+
+    def play(self, *args, **kwargs):
+        """Play nothing."""
+
+
 class Scene:
     """Base class for making PyGame Scenes."""
 
+    # Set by the game when running without a display or audio.
+    headless = False
+
+    # A static scene leaves the static layer on the screen between frames.
+    # Its draw only erases and redraws what it marked the frame before, so
+    # the whole layer is blitted once, when the scene starts.
+    static = False
+
     def __init__(self, screen, background_color, soundtrack=None):
         """Scene initializer"""
         self._screen = screen
         self._background = pygame.Surface(self._screen.get_size())
         self._background.fill(background_color)
         self._frame_rate = 60
+        self._tick_rate = 60
+        self._interpolation = 1.0
         self._is_valid = True
         self._soundtrack = soundtrack
         self._render_updates = None
+        self._static_layer = None
+        self._static_on_screen = False
+        # Rects drawn over the static layer in the last frame, and the
+        # rects changed on the screen since the last dirty_rects(); None
+        # when the whole screen changed.
+        self._marked = []
+        self._dirty = None
+
+    def draw_static(self, surface):
+        """Draw the parts of the scene that never change onto surface."""
+
+    @property
+    def static_layer(self):
+        """The background with draw_static flattened onto it."""
+        if self._static_layer is None:
+            self._static_layer = self._background.convert(self._screen)
+            self.draw_static(self._static_layer)
+        return self._static_layer
+
+    def invalidate(self):
+        """Draw the static layer again, as something else drew over it."""
+        self._static_on_screen = False
+
+    def mark(self, rects):
+        """Record rects drawn over the static layer this frame."""
+        self._marked.extend(rects)
+        self.touch(rects)
+
+    def touch(self, rects):
+        """Record rects changed on the screen this frame."""
+        if self._dirty is not None:
+            self._dirty.extend(rects)
+
+    def dirty_rects(self):
+        """
+        Return the rects changed on the screen since the last call, or None
+        if the whole screen changed.
+        """
+        (dirty, self._dirty) = (self._dirty, [])
+        return dirty
 
     def draw(self):
-        """Draw the scene."""
-        self._screen.blit(self._background, (0, 0))
+        """
+        Draw the scene: blit the static layer if it is not on the screen,
+        otherwise erase what was marked in the last frame.
+        """
+        if not self._static_on_screen:
+            self._screen.blit(self.static_layer, (0, 0))
+            self._static_on_screen = self.static
+            self._dirty = None
+        else:
+            for rect in self._marked:
+                self._screen.blit(self.static_layer, rect, rect)
+            self.touch(self._marked)
+        self._marked = []
 
     def process_event(self, event):
         """Process a game event by the scene."""
@@ -140,11 +210,22 @@ class Scene:
     def update_scene(self):
         """Update the scene state."""
 
+    def asset_keys(self):
+        """Return the (key, kind) pairs of the assets the scene will load."""
+        if self._soundtrack and not Scene.headless:
+            return [(self._soundtrack, "music")]
+        return []
+
     def start_scene(self):
         """Start the scene."""
-        if self._soundtrack:
+        # Composed on the first draw, after subclasses have set up what
+        # draw_static shows.
+        self._static_layer = None
+        self._static_on_screen = False
+        self._marked = []
+        if self._soundtrack and not Scene.headless:
             try:
-                pygame.mixer.music.load(self._soundtrack)
+                pygame.mixer.music.load(assets.manager.acquire(self._soundtrack, "music"))
                 pygame.mixer.music.set_volume(0.2)
             except pygame.error as pygame_error:
                 print("Cannot open the mixer?")
@@ -153,15 +234,31 @@ class Scene:
 
     def end_scene(self):
         """End the scene."""
-        if self._soundtrack and pygame.mixer.music.get_busy():
-            # Fade music out so there isn't an audible pop
-            pygame.mixer.music.fadeout(500)
-            pygame.mixer.music.stop()
+        if self._soundtrack and not Scene.headless:
+            if pygame.mixer.music.get_busy():
+                # Fade music out so there isn't an audible pop
+                pygame.mixer.music.fadeout(500)
+                pygame.mixer.music.stop()
+            assets.manager.release(self._soundtrack, "music")
 
     def frame_rate(self):
         """Return the frame rate the scene desires."""
         return self._frame_rate
 
+    def tick_rate(self):
+        """Return the simulation rate, in updates per second, of the scene."""
+        return self._tick_rate
+
+    @property
+    def interpolation(self):
+        """Fraction of a simulation step elapsed since the last update."""
+        return self._interpolation
+
+    @interpolation.setter
+    def interpolation(self, val):
+        """interpolation setter"""
+        self._interpolation = val
+
 
 class PressAnyKeyToExitScene(Scene):
     """Empty scene where it will invalidate when a key is pressed."""
@@ -176,6 +273,8 @@ class PressAnyKeyToExitScene(Scene):
 class MenuScene(Scene):
     """Scene with a title string and a polygon."""
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -195,47 +294,33 @@ class MenuScene(Scene):
         self._score = 0
         self._lives = 3
         self._next_life = 0
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
-            )
-        self._title = self._title_font.render(title, True, title_color)
-        self._subtitle_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._subtitle = self._subtitle_font.render(
-            "Programmed by Darren Cruz", True, rgbcolors.honeydew3
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
+        self._subtitle_font = fonts.get(24)
+        self._subtitle = fonts.render(
+            self._subtitle_font, "Programmed by Darren Cruz", True, rgbcolors.honeydew3
             )
-        self._play_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
+        self._play_font = fonts.get(24)
+        self._play = fonts.render(
+            self._play_font, "[P] Play", True, rgbcolors.black
             )
-        self._play = self._play_font.render(
-            "[P] Play", True, rgbcolors.black
+        self._how_to_play_font = fonts.get(24)
+        self._how_to_play = fonts.render(
+            self._how_to_play_font, "[H] How to Play", True, rgbcolors.black
             )
-        self._how_to_play_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
+        self._leaderboard_font = fonts.get(24)
+        self._leaderboard = fonts.render(
+            self._leaderboard_font, "[L] Leaderboard", True, rgbcolors.black
             )
-        self._how_to_play = self._how_to_play_font.render(
-            "[H] How to Play", True, rgbcolors.black
+        self._quit_font = fonts.get(24)
+        self._quit = fonts.render(
+            self._quit_font, "[Q] Quit", True, rgbcolors.black
             )
-        self._leaderboard_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._leaderboard = self._leaderboard_font.render(
-            "[L] Leaderboard", True, rgbcolors.black
-            )
-        self._quit_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._quit = self._quit_font.render(
-            "[Q] Quit", True, rgbcolors.black
-            )
-
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
 
+    def draw_static(self, surface):
+        """Draw the scene's text and shapes, which never change."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -244,7 +329,7 @@ class MenuScene(Scene):
         )
 
         # subtitle
-        self._screen.blit(
+        surface.blit(
             self._subtitle,
             (
                 400 - self._subtitle.get_width() // 2,
@@ -253,7 +338,7 @@ class MenuScene(Scene):
         )
         
         # [P] Play
-        self._screen.blit(
+        surface.blit(
             self._play,
             (
                 400 - self._play.get_width() // 2,
@@ -262,7 +347,7 @@ class MenuScene(Scene):
         )
 
         # [H] How to Play
-        self._screen.blit(
+        surface.blit(
             self._how_to_play,
             (
                 400 - self._how_to_play.get_width() // 2,
@@ -271,7 +356,7 @@ class MenuScene(Scene):
         )
 
         # [L] Leaderboard
-        self._screen.blit(
+        surface.blit(
             self._leaderboard,
             (
                 400 - self._leaderboard.get_width() // 2,
@@ -280,7 +365,7 @@ class MenuScene(Scene):
         )
 
         # [Q] Quit
-        self._screen.blit(
+        surface.blit(
             self._quit,
             (
                 400 - self._quit.get_width() // 2,
@@ -288,6 +373,12 @@ class MenuScene(Scene):
             ),
         )
 
+    def start_scene(self):
+        """Start the scene and begin loading the scenes that can follow it."""
+        super().start_scene()
+        for key in ('1', '2'):
+            assets.manager.prefetch(self._scene_manager.get(key).asset_keys())
+
     def end_scene(self):
         """End the scene"""
         super().end_scene()
@@ -314,7 +405,11 @@ class MenuScene(Scene):
 
 class GameScene(Scene):
     """Main gameplay scene"""
+
     spriteson = True
+    static = True
+    # Bullets shared by the player and the enemies.
+    bullet_capacity = 1024
     def __init__(
             self,
             screen,
@@ -325,25 +420,32 @@ class GameScene(Scene):
             background_color=rgbcolors.plum,
             soundtrack=None,
             continue_game=False,
-            restart=False
+            restart=False,
+            seed=None
         ):
-        """"Initialize the scene"""
+        """"Initialize the scene; seed seeds the enemies' random fire"""
         super().__init__(screen,
                          background_color,
                          soundtrack)
         self._scene_manager = scene_manager
         self._next_key = '2'
         self._barricades = []
-        self._enemies = []
-        self._explsion_sound = pygame.mixer.Sound(assets.get("explosionsfx"))
+        self._formation = None
+        self._explsion_sound = None
         self._delta_time = 0
         self._continue_game = continue_game
         self._restart = restart
 
-        self._player_bullets = []
-        self._last_enemy_shot = pygame.time.get_ticks()
+        self._bullets = BulletSystem(GameScene.bullet_capacity)
+        # The scene keeps its own random numbers and clock, in ms of
+        # simulated time, so a run is decided by the seed and the inputs.
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._sim_time = 0
+        self._ticks = 0
+        self._recorder = None
+        self._last_enemy_shot = 0
         self._enemy_cooldown = 1000
-        self._enemy_bullets = []
         self.width = self._screen.get_size()[0]
         self.height = self._screen.get_size()[1]
         self._is_game_over = False
@@ -352,32 +454,23 @@ class GameScene(Scene):
         self._lives = lives
         self._next_life = next_life
 
-        self._score_text_text = str(score)
-        self._score_font = pygame.font.Font(
-            pygame.font.get_default_font(), 18
-        )
-        self._score_text = self._score_font.render(self._score_text_text, True, rgbcolors.ghostwhite)        
+        self._score_font = fonts.get(18)
         
         self._lives = lives
-        self._lives_text_text = str(self._lives)
-        self._lives_font = pygame.font.Font(
-            pygame.font.get_default_font(), 18
-        )
-        self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)  
+        self._lives_font = fonts.get(18)
         
-        self._press_m_for_menu_font = pygame.font.Font(
-            pygame.font.get_default_font(), 18
-        )
-        self._press_m_for_menu = self._press_m_for_menu_font.render(
-            "[M] Main Menu", True, rgbcolors.black
+        self._press_m_for_menu_font = fonts.get(18)
+        self._press_m_for_menu = fonts.render(
+            self._press_m_for_menu_font, "[M] Main Menu", True, rgbcolors.black
         )
         
-        self._player = Player(pygame.math.Vector2(self.width//2, self.height-50))
+        # Loaded by start_scene so building the scene touches no files.
+        self._player = None
         self.make_barricades()
         self.make_enemies()
         
         if GameScene.spriteson:
-            self._render_updates = pygame.sprite.RenderUpdates(self._player)
+            self._render_updates = pygame.sprite.RenderUpdates()
             Explosion.containers = self._render_updates
         else:
             self._render_updates = None
@@ -390,16 +483,19 @@ class GameScene(Scene):
         y_step = gutter_width + enemy_width
         enemies_per_row = 11
         num_rows = 5
-        self._enemies = [
-            Enemy(
-                x_step + (j * x_step),
-                y_step + (i * y_step),
-                rgbcolors.maroon,
-                f"{i+1}, {j+1}",
-            )
-            for i in range(num_rows)
-            for j in range(enemies_per_row)
-        ]
+        self._formation = Formation(
+            [
+                (x_step + (j * x_step), y_step + (i * y_step))
+                for i in range(num_rows)
+                for j in range(enemies_per_row)
+            ],
+            rgbcolors.maroon,
+            [
+                f"{i+1}, {j+1}"
+                for i in range(num_rows)
+                for j in range(enemies_per_row)
+            ],
+        )
 
     def make_barricades(self):
         """Makes all barricades."""
@@ -414,7 +510,98 @@ class GameScene(Scene):
             )
             for j in range(barricades)
         ]
+        self._barricade_boxes = np.array(
+            [[b.rect.left, b.rect.top, b.rect.right, b.rect.bottom] for b in self._barricades]
+        )
     
+    def asset_keys(self):
+        """Return the (key, kind) pairs of the assets the scene will load."""
+        keys = super().asset_keys() + [("player", "image"), ("explosion2", "image")]
+        if not Scene.headless:
+            keys.append(("explosionsfx", "sound"))
+        return keys
+
+    def start_scene(self):
+        """Start the scene, loading its assets the first time."""
+        super().start_scene()
+        if self._player is None:
+            self._player = Player(pygame.math.Vector2(self.width//2, self.height-50))
+            if self._render_updates is not None:
+                self._render_updates.add(self._player)
+            preload(Explosion.frames)
+            if Scene.headless:
+                self._explsion_sound = SilentSound()
+            else:
+                self._explsion_sound = assets.manager.acquire("explosionsfx", "sound")
+        self._ticks = 0
+        if self._recorder is not None:
+            self._recorder.start(
+                self._scene_manager._continue_game, self._scene_manager._restart
+            )
+        # A continued or restarted round is set up before its first draw.
+        if self._scene_manager._continue_game:
+            print("continued")
+            self._scene_manager._stage += 1
+            self._bullets.clear()
+            self.make_enemies()
+            self._scene_manager._continue_game = False
+
+        if self._scene_manager._restart:
+            print("restarted")
+            self._scene_manager._stage = 1
+            self._bullets.clear()
+            self.make_enemies()
+            self._score = 0
+            self._lives = 3
+            self._next_life = 0
+            self._scene_manager._restart = False
+
+    @property
+    def bullets(self):
+        """Return the bullets in play, for their occupancy stats."""
+        return self._bullets
+
+    @property
+    def seed(self):
+        """Return the seed of the scene's random numbers."""
+        return self._seed
+
+    @seed.setter
+    def seed(self, val):
+        """seed setter; starts the random numbers over"""
+        self._seed = val
+        self._rng.seed(val)
+
+    def checksum(self):
+        """
+        Return a CRC32 of the simulated state: the enemies, the bullets,
+        the player, the counters and the random numbers.
+        """
+        crc = zlib.crc32(self._formation.tobytes())
+        crc = zlib.crc32(self._bullets.tobytes(), crc)
+        counters = struct.pack(
+            "<2d3i2d",
+            *self._player.position,
+            self._score,
+            self._lives,
+            self._next_life,
+            self._sim_time,
+            self._last_enemy_shot,
+        )
+        crc = zlib.crc32(counters, crc)
+        (_, rng_state, _) = self._rng.getstate()
+        return zlib.crc32(np.array(rng_state, dtype=np.uint32).tobytes(), crc)
+
+    @property
+    def recorder(self):
+        """Return the InputRecorder the scene's events go to, if any."""
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, val):
+        """recorder setter"""
+        self._recorder = val
+
     @property
     def delta_time(self):
         """delta_time getter"""
@@ -428,10 +615,14 @@ class GameScene(Scene):
     def end_scene(self):
         """End the scene"""
         super().end_scene()
+        if self._recorder is not None:
+            self._recorder.end(self._ticks, self._score, self.checksum())
         self._is_valid = True
 
     def process_event(self, event):
         """Process game events."""
+        if self._recorder is not None:
+            self._recorder.record(self._ticks, event)
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
             self._player.move_right()
         elif event.type == pygame.KEYUP and event.key == pygame.K_RIGHT:
@@ -443,7 +634,7 @@ class GameScene(Scene):
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
             bullet_target = self._player.position - pygame.math.Vector2(0, self.height)
             velocity = 0.25
-            self._player_bullets.append(Bullet(self._player.position, bullet_target, velocity))
+            self._bullets.fire(self._player.position, bullet_target, velocity)
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
             self._scene_manager.set_next_scene('0')
             self._is_valid = False
@@ -465,180 +656,135 @@ class GameScene(Scene):
     def update_scene(self):
         """Update the scene"""
         super().update_scene()
-        self._player.update()
-        self._restart = self._scene_manager._restart
-
-        if (self._continue_game == True):
-            print("continued")
-            self._player_bullets = []
-            self._enemy_bullets = []
-            self.make_enemies()
-            self._lives_text_text = str(self._lives)
-            self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-            self._score_text_text = str(self._score)
-            self._score_text = self._score_font.render(self._score_text_text, True, rgbcolors.ghostwhite)
-            self._continue_game = False
+        self._ticks += 1
+        self._sim_time += self._delta_time
+        # Sprites (the player and explosions) advance once per step.
+        if self._render_updates is not None:
+            self._render_updates.update()
 
-        if (self._restart == True):
-            print("restarted")
-            self._player_bullets = []
-            self._enemy_bullets = []
-            self.make_enemies()
-            self._score = 0
-            self._lives = 3
-            self._next_life = 0
-            self._lives_text_text = str(self._lives)
-            self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-            self._score_text_text = str(self._score)
-            self._score_text = self._score_font.render(self._score_text_text, True, rgbcolors.ghostwhite)
-            self._restart = False
-            self._scene_manager._restart = False
+        # The whole formation moves at once and only the enemies touching
+        # the player or the bottom are visited.
+        self._formation.update()
+        for enemy in self._formation.colliding(self._player.rect):
+            self._formation.kill(enemy)
+            Explosion(self._player)
+            self._explsion_sound.play()
+            self._lives -= 1
+        for enemy in self._formation.below(760):
+            self._formation.kill(enemy)
+            self._is_game_over = True
+            self._lives = 0
+            pygame.event.post(LOSE_Event)
 
-        for enemy in self._enemies:
-            enemy.update()
-            index_player = enemy.rect.collidelist([self._player.rect])
-            if index_player > -1:
-                self._enemies.remove(enemy)
-                Explosion(self._player)
-                self._explsion_sound.play()
-                self._lives -= 1
-                self._lives_text_text = str(self._lives)
-                self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-            if enemy.position.y > 760:
-                self._enemies.remove(enemy)
-                self._is_game_over = True
-                self._lives = 0
-                self._lives_text_text = str(self._lives)
-                self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-                pygame.event.post(LOSE_Event)
-
-        time_now = pygame.time.get_ticks()
-        if time_now - self._last_enemy_shot > self._enemy_cooldown and len(self._enemy_bullets) < 5 and len(self._enemies) > 0:
-            chosen_enemy = random.choice(self._enemies)
+        time_now = self._sim_time
+        if time_now - self._last_enemy_shot > self._enemy_cooldown and self._bullets.count(BulletSystem.ENEMY) < 5 and len(self._formation) > 0:
+            chosen_enemy = self._formation.choice(self._rng)
             bullet_target = chosen_enemy.position + pygame.math.Vector2(0, 760 - chosen_enemy.position.y)
             velocity = 0.25
-            self._enemy_bullets.append(Bullet(chosen_enemy.position, bullet_target, velocity, rgbcolors.coral))
+            self._bullets.fire(
+                chosen_enemy.position, bullet_target, velocity, BulletSystem.ENEMY, rgbcolors.coral
+            )
             self._last_enemy_shot = time_now
     
-        for bullet in self._player_bullets:
-            bullet.update(self.delta_time)
-            if bullet.should_die():
-                self._player_bullets.remove(bullet)
-            else:
-                index_barricade = bullet.rect.collidelist([b.rect for b in self._barricades])
-                if index_barricade > -1:
-                    self._player_bullets.remove(bullet)
-                index_enemy = bullet.rect.collidelist([e.rect for e in self._enemies])
-                if index_enemy > -1:
-                    Explosion(self._enemies[index_enemy])
-                    self._explsion_sound.play()
-                    self._enemies[index_enemy].is_exploding = True
-                    # remove an enemy
-                    self._enemies.remove(self._enemies[index_enemy])
-                    # self._explosion_sound.play()
-                    # remove a bullet
-                    self._player_bullets.remove(bullet)
-                    self._score += 10
-                    self._next_life += 10
-                    # add an extra life after every 500 points
-                    if self._next_life == 500:
-                        self._lives += 1
-                        self._next_life = 0
-                        self._lives_text_text = str(self._lives)
-                        self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-                    self._score_text_text = str(self._score)
-                    self._score_text = self._score_font.render(self._score_text_text, True, rgbcolors.ghostwhite)
-        
-        for bullet in self._enemy_bullets:
-            bullet.update(self._delta_time)
-            if bullet.should_die():
-                self._enemy_bullets.remove(bullet)
-            else:
-                index_barricade = bullet.rect.collidelist([b.rect for b in self._barricades])
-                if index_barricade > -1:
-                    self._enemy_bullets.remove(bullet)
-                index_player = bullet.rect.collidelist([self._player.rect])
-                if index_player > -1:
-                    self._enemy_bullets.remove(bullet)
-                    Explosion(self._player)
-                    self._explsion_sound.play()
-                    # self._player.is_exploding = True
-                    self._lives -= 1
-                    self._lives_text_text = str(self._lives)
-                    self._lives_text = self._lives_font.render(self._lives_text_text, True, rgbcolors.ghostwhite)
-        
+        enemies, enemy_boxes = self._formation.boxes()
+        hit_enemies, player_hits = self._bullets.update(
+            self._delta_time, self._barricade_boxes, enemy_boxes, self._player.rect
+        )
+        for index in hit_enemies:
+            enemy = enemies[index]
+            Explosion(enemy)
+            self._explsion_sound.play()
+            enemy.is_exploding = True
+            # remove an enemy
+            self._formation.kill(enemy)
+            self._score += 10
+            self._next_life += 10
+            # add an extra life after every 500 points
+            if self._next_life == 500:
+                self._lives += 1
+                self._next_life = 0
+
+        for _ in range(player_hits):
+            Explosion(self._player)
+            self._explsion_sound.play()
+            # self._player.is_exploding = True
+            self._lives -= 1
+
         if self._lives == 0:
             self._is_game_over = True
             pygame.event.post(LOSE_Event)
 
-        if len(self._enemies) == 0:
+        if len(self._formation) == 0:
             self._is_game_over = True
             pygame.event.post(WIN_Event)
     
+    def draw_static(self, surface):
+        """Draw the barricades and the labels of the HUD."""
+        #draw barricades
+        for barricade in self._barricades:
+            barricade.draw(surface)
+
+        #blit "[M] for Menu"
+        surface.blit(
+            self._press_m_for_menu,
+            (
+                400 - self._press_m_for_menu.get_width() // 2,
+                775,
+            ),
+        )
+        pygame.draw.polygon(surface, rgbcolors.maroon4, [(38,792),(30,784),(30,779),(33,776),(35,776),(38,779),(41,776),(43,776),(46,779),(46,784)])
+
     def draw(self):
         """Draw the scene."""
         super().draw()
         # if not self._render_updates:
 
         #draw enemies
-        for enemy in self._enemies:
-            if not enemy._is_exploding:
-                enemy.draw(self._screen)
-
-        #draw barricades
-        for barricade in self._barricades:
-            barricade.draw(self._screen)
+        self.mark(self._formation.draw(self._screen, self._interpolation))
 
-        #draw player bullets
-        for bullet in self._player_bullets:
-            bullet.draw(self._screen)
+        #draw bullets
+        self.mark(self._bullets.draw(self._screen, self._interpolation))
 
-        #draw enemy bullets
-        for bullet in self._enemy_bullets:
-            bullet.draw(self._screen)
-
-        #blit the score
-        self._screen.blit(
-            self._score_text,
+        #blit the score and lives, rendered again only when they change
+        score_text = fonts.render(
+            self._score_font, str(self._score), True, rgbcolors.ghostwhite
+        )
+        lives_text = fonts.render(
+            self._lives_font, str(self._lives), True, rgbcolors.ghostwhite
+        )
+        score_rect = self._screen.blit(
+            score_text,
             (
                 715,
                 775
             ),
         )
 
-        #blit "[M] for Menu"
-        self._screen.blit(
-            self._press_m_for_menu,
-            (
-                400 - self._press_m_for_menu.get_width() // 2,
-                775,
-            ),
-        )
-
         #blit lives
-        self._screen.blit(
-            self._lives_text,
+        lives_rect = self._screen.blit(
+            lives_text,
             (
                 15,
                 775
             )
         )
-        pygame.draw.polygon(self._screen, rgbcolors.maroon4, [(38,792),(30,784),(30,779),(33,776),(35,776),(38,779),(41,776),(43,776),(46,779),(46,784)])
-
+        self.mark((score_rect, lives_rect))
 
     def render_updates(self):
         """Render updates"""
-        if self._render_updates:
+        if self._render_updates is not None:
             super().render_updates()
             # if self._render_updates:
-            self._render_updates.clear(self._screen, self._background)
-            self._render_updates.update()
-            dirty = self._render_updates.draw(self._screen)
+            self._player.interpolate(self._interpolation)
+            self._render_updates.clear(self._screen, self.static_layer)
+            self.touch(self._render_updates.draw(self._screen))
 
 
 class HowToPlayScene(Scene):
     """Scene for instructions."""
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -656,160 +802,128 @@ class HowToPlayScene(Scene):
         self._scene_manager = scene_manager
         self._next_key = '0'
         
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
+        self._legend_font = fonts.get(36)
+        self._legend = fonts.render(
+            self._legend_font, "Legend: ", True, rgbcolors.maroon
             )
-        self._title = self._title_font.render(title, True, title_color)
-        self._legend_font = pygame.font.Font(
-            pygame.font.get_default_font(), 36
-            )
-        self._legend = self._legend_font.render(
-            "Legend: ", True, rgbcolors.maroon
-            )
-        self._player = Player(pygame.math.Vector2(84, 359))
-        self._render_updates = pygame.sprite.RenderUpdates(self._player)
+        # Loaded by start_scene so building the scene touches no files.
+        self._player = None
+        self._render_updates = pygame.sprite.RenderUpdates()
 
-        self._you_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._you = self._you_font.render(
-            "--- YOU", True, rgbcolors.black
+        self._you_font = fonts.get(24)
+        self._you = fonts.render(
+            self._you_font, "--- YOU", True, rgbcolors.black
         )
-        self._enemy = Enemy(84, 409, rgbcolors.maroon)
+        self._enemy = Formation([(84, 409)], rgbcolors.maroon)[0]
 
-        self._enemy_text_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-        )
-        self._enemy_text = self._enemy_text_font.render(
-            "--- ENEMY", True, rgbcolors.black
+        self._enemy_text_font = fonts.get(24)
+        self._enemy_text = fonts.render(
+            self._enemy_text_font, "--- ENEMY", True, rgbcolors.black
         )
 
         self._barricade = Barricade(84, 459)
-        self._barricade_text_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-        )
-        self._barricade_text = self._barricade_text_font.render(
-            "--- BARRICADE", True, rgbcolors.black
+        self._barricade_text_font = fonts.get(24)
+        self._barricade_text = fonts.render(
+            self._barricade_text_font, "--- BARRICADE", True, rgbcolors.black
         )
 
-        self._your_bullet_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-        )
-        self._your_bullet = self._your_bullet_font.render(
-            "--- YOUR BULLET", True, rgbcolors.black
+        self._your_bullet_font = fonts.get(24)
+        self._your_bullet = fonts.render(
+            self._your_bullet_font, "--- YOUR BULLET", True, rgbcolors.black
         )
 
-        self._enemy_bullet_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-        )
-        self._enemy_bullet = self._your_bullet_font.render(
-            "--- ENEMY BULLET", True, rgbcolors.black
+        self._enemy_bullet_font = fonts.get(24)
+        self._enemy_bullet = fonts.render(
+            self._your_bullet_font, "--- ENEMY BULLET", True, rgbcolors.black
         )
 
-        self._goal_font = pygame.font.Font(
-            pygame.font.get_default_font(), 36
-            )
-        self._goal = self._goal_font.render(
-            "Goal: ", True, rgbcolors.maroon
+        self._goal_font = fonts.get(36)
+        self._goal = fonts.render(
+            self._goal_font, "Goal: ", True, rgbcolors.maroon
             )
         
-        self._goal_1_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_1 = self._goal_1_font.render(
-            "Kill all enemies on the screen", True, rgbcolors.black
+        self._goal_1_font = fonts.get(24)
+        self._goal_1 = fonts.render(
+            self._goal_1_font, "Kill all enemies on the screen", True, rgbcolors.black
             )
         
-        self._goal_2_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_2 = self._goal_2_font.render(
-            "You lose if all your lives are", True, rgbcolors.black
+        self._goal_2_font = fonts.get(24)
+        self._goal_2 = fonts.render(
+            self._goal_2_font, "You lose if all your lives are", True, rgbcolors.black
             )
         
-        self._goal_3_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_3 = self._goal_3_font.render(
-            "are gone or if an enemy reaches", True, rgbcolors.black
+        self._goal_3_font = fonts.get(24)
+        self._goal_3 = fonts.render(
+            self._goal_3_font, "are gone or if an enemy reaches", True, rgbcolors.black
             )
 
-        self._goal_4_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_4 = self._goal_4_font.render(
-            "the bottom.", True, rgbcolors.black
+        self._goal_4_font = fonts.get(24)
+        self._goal_4 = fonts.render(
+            self._goal_4_font, "the bottom.", True, rgbcolors.black
             )
         
-        self._goal_5_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_5 = self._goal_5_font.render(
-            "The barricade stops bullets", True, rgbcolors.black
+        self._goal_5_font = fonts.get(24)
+        self._goal_5 = fonts.render(
+            self._goal_5_font, "The barricade stops bullets", True, rgbcolors.black
             )
         
-        self._goal_6_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_6 = self._goal_6_font.render(
-            "from passing.", True, rgbcolors.black
+        self._goal_6_font = fonts.get(24)
+        self._goal_6 = fonts.render(
+            self._goal_6_font, "from passing.", True, rgbcolors.black
             )
         
-        self._goal_7_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_7 = self._goal_7_font.render(
-            "You get an extra life every", True, rgbcolors.black
+        self._goal_7_font = fonts.get(24)
+        self._goal_7 = fonts.render(
+            self._goal_7_font, "You get an extra life every", True, rgbcolors.black
             )
         
-        self._goal_8_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._goal_8 = self._goal_8_font.render(
-            "500 points.", True, rgbcolors.black
+        self._goal_8_font = fonts.get(24)
+        self._goal_8 = fonts.render(
+            self._goal_8_font, "500 points.", True, rgbcolors.black
             )
         
-        self._controls_font = pygame.font.Font(
-            pygame.font.get_default_font(), 36
-            )
-        self._controls = self._controls_font.render(
-            "Controls:", True, rgbcolors.maroon
+        self._controls_font = fonts.get(36)
+        self._controls = fonts.render(
+            self._controls_font, "Controls:", True, rgbcolors.maroon
             )
         
-        self._left_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._left = self._left_font.render(
-            "[<-] --- Move Left", True, rgbcolors.black
+        self._left_font = fonts.get(24)
+        self._left = fonts.render(
+            self._left_font, "[<-] --- Move Left", True, rgbcolors.black
             )
         
-        self._right_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._right = self._right_font.render(
-            "[->] --- Move Right", True, rgbcolors.black
+        self._right_font = fonts.get(24)
+        self._right = fonts.render(
+            self._right_font, "[->] --- Move Right", True, rgbcolors.black
             )
         
-        self._shoot_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._shoot = self._shoot_font.render(
-            "[SPACE] --- Shoot", True, rgbcolors.black
+        self._shoot_font = fonts.get(24)
+        self._shoot = fonts.render(
+            self._shoot_font, "[SPACE] --- Shoot", True, rgbcolors.black
             )
         
-        self._press_m_for_menu_font = pygame.font.Font(
-            pygame.font.get_default_font(), 18
-        )
-        self._press_m_for_menu = self._press_m_for_menu_font.render(
-            "[ESC] or [M] Main Menu", True, rgbcolors.black
+        self._press_m_for_menu_font = fonts.get(18)
+        self._press_m_for_menu = fonts.render(
+            self._press_m_for_menu_font, "[ESC] or [M] Main Menu", True, rgbcolors.black
         )
     
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
+    def asset_keys(self):
+        """Return the (key, kind) pairs of the assets the scene will load."""
+        return super().asset_keys() + [("player", "image")]
 
+    def start_scene(self):
+        """Start the scene, loading its assets the first time."""
+        super().start_scene()
+        if self._player is None:
+            self._player = Player(pygame.math.Vector2(84, 359))
+            self._render_updates.add(self._player)
+
+    def draw_static(self, surface):
+        """Draw the scene's text and shapes, which never change."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -818,7 +932,7 @@ class HowToPlayScene(Scene):
         )
 
         # Legend
-        self._screen.blit(
+        surface.blit(
             self._legend,
             (
                 200 - self._legend.get_width() // 2,
@@ -827,7 +941,7 @@ class HowToPlayScene(Scene):
         )
 
         # --- YOU
-        self._screen.blit(
+        surface.blit(
             self._you,
             (
                 150,
@@ -835,10 +949,10 @@ class HowToPlayScene(Scene):
             ),
         )
     
-        self._enemy.draw(self._screen)
+        self._enemy.draw(surface)
         
         # --- ENEMY
-        self._screen.blit(
+        surface.blit(
             self._enemy_text,
             (
                 150,
@@ -846,10 +960,10 @@ class HowToPlayScene(Scene):
             ),
         )
 
-        self._barricade.draw(self._screen)
+        self._barricade.draw(surface)
 
         # --- BARRICADE
-        self._screen.blit(
+        surface.blit(
             self._barricade_text,
             (
                 150,
@@ -857,10 +971,10 @@ class HowToPlayScene(Scene):
             ),
         )
 
-        pygame.draw.circle(self._screen, rgbcolors.light_cyan, (84, 509), 5)
+        pygame.draw.circle(surface, rgbcolors.light_cyan, (84, 509), 5)
 
         # --- YOUR BULLET
-        self._screen.blit(
+        surface.blit(
             self._your_bullet,
             (
                 150,
@@ -868,10 +982,10 @@ class HowToPlayScene(Scene):
             )
         )
 
-        pygame.draw.circle(self._screen, rgbcolors.coral, (84, 559), 5)
+        pygame.draw.circle(surface, rgbcolors.coral, (84, 559), 5)
 
         # --- YOUR BULLET
-        self._screen.blit(
+        surface.blit(
             self._enemy_bullet,
             (
                 150,
@@ -880,7 +994,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal
-        self._screen.blit(
+        surface.blit(
             self._goal,
             (
                 600 - self._goal.get_width() // 2,
@@ -889,7 +1003,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 1
-        self._screen.blit(
+        surface.blit(
             self._goal_1,
             (
                 600 - self._goal_1.get_width() // 2,
@@ -898,7 +1012,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 2
-        self._screen.blit(
+        surface.blit(
             self._goal_2,
             (
                 600 - self._goal_2.get_width() // 2,
@@ -907,7 +1021,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 3
-        self._screen.blit(
+        surface.blit(
             self._goal_3,
             (
                 600 - self._goal_3.get_width() // 2,
@@ -916,7 +1030,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 4
-        self._screen.blit(
+        surface.blit(
             self._goal_4,
             (
                 600 - self._goal_4.get_width() // 2,
@@ -925,7 +1039,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 5
-        self._screen.blit(
+        surface.blit(
             self._goal_5,
             (
                 600 - self._goal_5.get_width() // 2,
@@ -934,7 +1048,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 6
-        self._screen.blit(
+        surface.blit(
             self._goal_6,
             (
                 600 - self._goal_6.get_width() // 2,
@@ -943,7 +1057,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 7
-        self._screen.blit(
+        surface.blit(
             self._goal_7,
             (
                 600 - self._goal_7.get_width() // 2,
@@ -952,7 +1066,7 @@ class HowToPlayScene(Scene):
         )
 
         # Goal 5
-        self._screen.blit(
+        surface.blit(
             self._goal_5,
             (
                 600 - self._goal_5.get_width() // 2,
@@ -961,7 +1075,7 @@ class HowToPlayScene(Scene):
         )
 
         # Controls
-        self._screen.blit(
+        surface.blit(
             self._controls,
             (
                 400 - self._controls.get_width() // 2,
@@ -970,7 +1084,7 @@ class HowToPlayScene(Scene):
         )
 
         # Left
-        self._screen.blit(
+        surface.blit(
             self._left,
             (
                 400 - self._left.get_width() // 2,
@@ -979,7 +1093,7 @@ class HowToPlayScene(Scene):
         )
 
         # Right
-        self._screen.blit(
+        surface.blit(
             self._right,
             (
                 400 - self._right.get_width() // 2,
@@ -988,7 +1102,7 @@ class HowToPlayScene(Scene):
         )
 
         # Shoot
-        self._screen.blit(
+        surface.blit(
             self._shoot,
             (
                 400 - self._shoot.get_width() // 2,
@@ -997,7 +1111,7 @@ class HowToPlayScene(Scene):
         )
 
         #[M] for Menu
-        self._screen.blit(
+        surface.blit(
             self._press_m_for_menu,
             (
                 400 - self._press_m_for_menu.get_width() // 2,
@@ -1023,17 +1137,19 @@ class HowToPlayScene(Scene):
 
     def render_updates(self):
         """Render updates"""
-        if self._render_updates:
+        if self._render_updates is not None:
             super().render_updates()
             # if self._render_updates:
-            self._render_updates.clear(self._screen, self._background)
+            self._render_updates.clear(self._screen, self.static_layer)
             self._render_updates.update()
-            dirty = self._render_updates.draw(self._screen)
+            self.touch(self._render_updates.draw(self._screen))
 
 
 class LeaderboardScene(Scene):
     """Scene for the leaderboard """
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -1051,34 +1167,35 @@ class LeaderboardScene(Scene):
         self._scene_manager = scene_manager
         self._next_key = '0'
         
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
-            )
-        self._title = self._title_font.render(title, True, title_color)
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
 
-        self._press_m_for_menu_font = pygame.font.Font(
-            pygame.font.get_default_font(), 18
-        )
-        self._press_m_for_menu = self._press_m_for_menu_font.render(
-            "[ESC] or [M] Main Menu", True, rgbcolors.black
+        self._press_m_for_menu_font = fonts.get(18)
+        self._press_m_for_menu = fonts.render(
+            self._press_m_for_menu_font, "[ESC] or [M] Main Menu", True, rgbcolors.black
         )
 
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
-
-        self._leaderboard = []
-        
-        if os.path.exists(pickle_file):
-            with open(pickle_file, "rb") as opened:
-                leaderboard = pickle.load(opened)
-            for player in leaderboard:
-                self._leaderboard.append(player)
+        self._row_font = fonts.get(36)
+        self._rows = []
 
-        self._leaderboard = sorted(self._leaderboard, key=lambda x: x.score, reverse=True)
+    def start_scene(self):
+        """Start the scene, rendering the current leaderboard once."""
+        super().start_scene()
+        leaderboard.store.refresh()
+        self._rows = [
+            fonts.render(
+                self._row_font,
+                f"{leaderboard.store.rank(player.score)}. {player.initials} ----- {player.score}",
+                True,
+                rgbcolors.black,
+            )
+            for player in leaderboard.store.top()
+        ]
 
+    def draw_static(self, surface):
+        """Draw the scene's text and shapes, which never change."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -1086,188 +1203,18 @@ class LeaderboardScene(Scene):
             ),
         )
 
-        if len(self._leaderboard) > 0:
-            self._leaderboard_1_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_1 = self._leaderboard_1_font.render(
-                f"1. {self._leaderboard[0].initials} ----- {self._leaderboard[0].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 1:
-            self._leaderboard_2_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_2 = self._leaderboard_2_font.render(
-                f"2. {self._leaderboard[1].initials} ----- {self._leaderboard[1].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 2:
-            self._leaderboard_3_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_3 = self._leaderboard_3_font.render(
-                f"3. {self._leaderboard[2].initials} ----- {self._leaderboard[2].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 3:
-            self._leaderboard_4_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_4 = self._leaderboard_4_font.render(
-                f"4. {self._leaderboard[3].initials} ----- {self._leaderboard[3].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 4:
-            self._leaderboard_5_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_5 = self._leaderboard_5_font.render(
-                f"5. {self._leaderboard[4].initials} ----- {self._leaderboard[4].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 5:
-            self._leaderboard_6_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_6 = self._leaderboard_6_font.render(
-                f"6. {self._leaderboard[5].initials} ----- {self._leaderboard[5].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 6:
-            self._leaderboard_7_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_7 = self._leaderboard_7_font.render(
-                f"7. {self._leaderboard[6].initials} ----- {self._leaderboard[6].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 7:
-            self._leaderboard_8_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_8 = self._leaderboard_8_font.render(
-                f"8. {self._leaderboard[7].initials} ----- {self._leaderboard[7].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 8:
-            self._leaderboard_9_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_9 = self._leaderboard_9_font.render(
-                f"9. {self._leaderboard[8].initials} ----- {self._leaderboard[8].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 9:
-            self._leaderboard_10_font = pygame.font.Font(
-                pygame.font.get_default_font(), 36
-                )
-            self._leaderboard_10 = self._leaderboard_10_font.render(
-                f"10. {self._leaderboard[9].initials} ----- {self._leaderboard[9].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 0:
-            # Leaderboard 1
-            self._screen.blit(
-                self._leaderboard_1,
-                (
-                    400 - self._leaderboard_1.get_width() // 2,
-                    225 - self._leaderboard_1.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 1:
-            # Leaderboard 2
-            self._screen.blit(
-                self._leaderboard_2,
-                (
-                    400 - self._leaderboard_2.get_width() // 2,
-                    275 - self._leaderboard_2.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 2:
-            # Leaderboard 3
-            self._screen.blit(
-                self._leaderboard_3,
-                (
-                    400 - self._leaderboard_3.get_width() // 2,
-                    325 - self._leaderboard_3.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 3:
-            # Leaderboard 4
-            self._screen.blit(
-                self._leaderboard_4,
-                (
-                    400 - self._leaderboard_4.get_width() // 2,
-                    375 - self._leaderboard_4.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 4:
-            # Leaderboard 5
-            self._screen.blit(
-                self._leaderboard_5,
-                (
-                    400 - self._leaderboard_5.get_width() // 2,
-                    425 - self._leaderboard_5.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 5:
-            # Leaderboard 6
-            self._screen.blit(
-                self._leaderboard_6,
-                (
-                    400 - self._leaderboard_6.get_width() // 2,
-                    475 - self._leaderboard_6.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 6:
-            # Leaderboard 7
-            self._screen.blit(
-                self._leaderboard_7,
-                (
-                    400 - self._leaderboard_7.get_width() // 2,
-                    525 - self._leaderboard_7.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 7:
-            # Leaderboard 8
-            self._screen.blit(
-                self._leaderboard_8,
+        # Leaderboard rows, 50 pixels apart
+        for (i, row) in enumerate(self._rows):
+            surface.blit(
+                row,
                 (
-                    400 - self._leaderboard_8.get_width() // 2,
-                    575 - self._leaderboard_8.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 8:
-            # Leaderboard 9
-            self._screen.blit(
-                self._leaderboard_9,
-                (
-                    400 - self._leaderboard_9.get_width() // 2,
-                    625 - self._leaderboard_9.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 9:
-            # Leaderboard 10
-            self._screen.blit(
-                self._leaderboard_10,
-                (
-                    400 - self._leaderboard_10.get_width() // 2,
-                    675 - self._leaderboard_10.get_height() // 2,
+                    400 - row.get_width() // 2,
+                    225 + 50 * i - row.get_height() // 2,
                 )
             )
 
         #[M] for Menu
-        self._screen.blit(
+        surface.blit(
             self._press_m_for_menu,
             (
                 400 - self._press_m_for_menu.get_width() // 2,
@@ -1295,6 +1242,8 @@ class LeaderboardScene(Scene):
 class WinScene(Scene):
     """Scene for when the player wins."""
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -1317,30 +1266,22 @@ class WinScene(Scene):
         self._score = score
         self._lives = lives
         self._next_life = next_life
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
-            )
-        self._title = self._title_font.render(title, True, title_color)
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
 
-        self._continue_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
+        self._continue_font = fonts.get(24)
+        self._continue = fonts.render(
+            self._continue_font, "[C] Continue", True, rgbcolors.black
             )
-        self._continue = self._continue_font.render(
-            "[C] Continue", True, rgbcolors.black
-            )
-        self._end_game_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-            )
-        self._end_game = self._end_game_font.render(
-            "[E] End the game", True, rgbcolors.black
+        self._end_game_font = fonts.get(24)
+        self._end_game = fonts.render(
+            self._end_game_font, "[E] End the game", True, rgbcolors.black
         )
 
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
-
+    def draw_static(self, surface):
+        """Draw the scene's text and shapes, which never change."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -1349,7 +1290,7 @@ class WinScene(Scene):
         )
 
         # [C] Continue
-        self._screen.blit(
+        surface.blit(
             self._continue,
             (
                 400 - self._continue.get_width() // 2,
@@ -1358,7 +1299,7 @@ class WinScene(Scene):
         )
 
         # [E] End the game
-        self._screen.blit(
+        surface.blit(
             self._end_game,
             (
                 400 - self._end_game.get_width() // 2,
@@ -1387,6 +1328,8 @@ class WinScene(Scene):
 class LoseScene(Scene):
     """Scene for when the player loses."""
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -1405,24 +1348,18 @@ class LoseScene(Scene):
         self._scene_manager = scene_manager
         self._next_key = '6'
         self._score = score
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
-            )
-        self._title = self._title_font.render(title, True, title_color)
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
 
-        self._press_enter_to_continue_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
+        self._press_enter_to_continue_font = fonts.get(24)
+        self._press_enter_to_continue = fonts.render(
+            self._press_enter_to_continue_font, "Press Enter to Continue", True, rgbcolors.black
             )
-        self._press_enter_to_continue = self._press_enter_to_continue_font.render(
-            "Press Enter to Continue", True, rgbcolors.black
-            )
-
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
 
+    def draw_static(self, surface):
+        """Draw the scene's text and shapes, which never change."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -1431,7 +1368,7 @@ class LoseScene(Scene):
         )
 
         # Press Enter to Continue
-        self._screen.blit(
+        surface.blit(
             self._press_enter_to_continue,
             (
                 400 - self._press_enter_to_continue.get_width() // 2,
@@ -1454,17 +1391,19 @@ class LoseScene(Scene):
 
     def render_updates(self):
         """Render updates"""
-        if self._render_updates:
+        if self._render_updates is not None:
             super().render_updates()
             # if self._render_updates:
-            self._render_updates.clear(self._screen, self._background)
+            self._render_updates.clear(self._screen, self.static_layer)
             self._render_updates.update()
-            dirty = self._render_updates.draw(self._screen)
+            self.touch(self._render_updates.draw(self._screen))
 
 
 class EnterInitialsScene(Scene):
     """Scene for when the player loses."""
 
+    static = True
+
     def __init__(
         self,
         screen,
@@ -1485,59 +1424,59 @@ class EnterInitialsScene(Scene):
 
         self._leaderboard = []
         
-        if os.path.exists(pickle_file):
-            with open(pickle_file, "rb") as opened:
-                leaderboard = pickle.load(opened)
-            for player in leaderboard:
-                self._leaderboard.append(player)
-
-        self._leaderboard = sorted(self._leaderboard, key=lambda x: x.score, reverse = True)
-        
-        self._title_font = pygame.font.Font(
-            pygame.font.get_default_font(), title_size
-            )
-        self._title = self._title_font.render(title, True, title_color)
+        self._title_font = fonts.get(title_size)
+        self._title = fonts.render(self._title_font, title, True, title_color)
 
         self._score = score
-        self._score_text_font = pygame.font.Font(
-            pygame.font.get_default_font(), 60
-            )
+        self._score_text_font = fonts.get(60)
 
         self._initials_text =""
-        self._initials_text_font = pygame.font.Font(
-            pygame.font.get_default_font(), 60
-            )
-        self._initials = self._initials_text_font.render(
-            self._initials_text, True, rgbcolors.black
-            )
-        self._press_enter_to_submit_score_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
+        self._initials_text_font = fonts.get(60)
+        self._initials = fonts.render(
+            self._initials_text_font, self._initials_text, True, rgbcolors.black
             )
-        self._press_enter_to_submit_score = self._press_enter_to_submit_score_font.render(
-            "Press Enter to Submit Score", True, rgbcolors.black
+        self._press_enter_to_submit_score_font = fonts.get(24)
+        self._press_enter_to_submit_score = fonts.render(
+            self._press_enter_to_submit_score_font, "Press Enter to Submit Score", True, rgbcolors.black
             )
         
-        self._skip_font = pygame.font.Font(
-            pygame.font.get_default_font(), 24
-        )
-        self._skip = self._skip_font.render(
-            "[/] to skip", True, rgbcolors.black
+        self._skip_font = fonts.get(24)
+        self._skip = fonts.render(
+            self._skip_font, "[/] to skip", True, rgbcolors.black
         )
         
-        self._leaderboard_text_font = pygame.font.Font(
-            pygame.font.get_default_font(), 48
-        )
-        self._leaderboard_text = self._leaderboard_text_font.render(
-            "Leaderboard:", True, rgbcolors.maroon
+        self._leaderboard_text_font = fonts.get(48)
+        self._leaderboard_text = fonts.render(
+            self._leaderboard_text_font, "Leaderboard:", True, rgbcolors.maroon
         )
 
-    def draw(self):
-        """Draw the scene."""
-        super().draw()
-        self._leaderboard = sorted(self._leaderboard, key=lambda x: x.score, reverse = True)
+        self._rank_text_font = fonts.get(36)
+        self._row_font = fonts.get(24)
+        self._rows = []
 
+    def start_scene(self):
+        """Start the scene, rendering the leaderboard and the player's rank once."""
+        super().start_scene()
+        leaderboard.store.refresh()
+        self._score = self._scene_manager._score
+        self._leaderboard = leaderboard.store.top()
+        self._score_text = fonts.render(
+            self._score_text_font, f"Score: {self._score}", True, rgbcolors.maroon
+            )
+        self._rank_text = fonts.render(
+            self._rank_text_font, f"Rank: {leaderboard.store.rank(self._score)}", True, rgbcolors.black
+            )
+        self._rows = [
+            fonts.render(
+                self._row_font, f"{player.initials} ----- {player.score}", True, rgbcolors.black
+            )
+            for player in self._leaderboard
+        ]
+
+    def draw_static(self, surface):
+        """Draw everything but the initials being typed."""
         # title
-        self._screen.blit(
+        surface.blit(
             self._title,
             (
                 400 - self._title.get_width() // 2,
@@ -1546,10 +1485,7 @@ class EnterInitialsScene(Scene):
         )
 
         # Score: _______
-        self._score_text = self._score_text_font.render(
-            f"Score: {self._score}", True, rgbcolors.maroon
-            )
-        self._screen.blit(
+        surface.blit(
             self._score_text,
             (
                 400 - self._score_text.get_width() // 2,
@@ -1557,20 +1493,17 @@ class EnterInitialsScene(Scene):
             ),
         )
 
-        # Initials "__ __ __"
-        self._initials = self._initials_text_font.render(
-            self._initials_text, True, rgbcolors.black
-            )
-        self._screen.blit(
-            self._initials,
+        # Rank: __
+        surface.blit(
+            self._rank_text,
             (
-                600 - self._initials.get_width() // 2,
-                440 - self._initials.get_height() // 2,
+                600 - self._rank_text.get_width() // 2,
+                370 - self._rank_text.get_height() // 2,
             ),
         )
 
         # Press Enter to Submit
-        self._screen.blit(
+        surface.blit(
             self._press_enter_to_submit_score,
             (
                 600 - self._press_enter_to_submit_score.get_width() // 2,
@@ -1579,7 +1512,7 @@ class EnterInitialsScene(Scene):
         )
 
         # skip
-        self._screen.blit(
+        surface.blit(
             self._skip,
             (
                 600 - self._skip.get_width() // 2,
@@ -1588,7 +1521,7 @@ class EnterInitialsScene(Scene):
         )
 
         # Leaderboard:
-        self._screen.blit(
+        surface.blit(
             self._leaderboard_text,
             (
                 200 - self._leaderboard_text.get_width() // 2,
@@ -1596,221 +1529,69 @@ class EnterInitialsScene(Scene):
             )
         )
 
-        if len(self._leaderboard) > 0:
-            self._leaderboard_1_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_1 = self._leaderboard_1_font.render(
-                f"{self._leaderboard[0].initials} ----- {self._leaderboard[0].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 1:
-            self._leaderboard_2_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_2 = self._leaderboard_2_font.render(
-                f"{self._leaderboard[1].initials} ----- {self._leaderboard[1].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 2:
-            self._leaderboard_3_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_3 = self._leaderboard_3_font.render(
-                f"{self._leaderboard[2].initials} ----- {self._leaderboard[2].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 3:
-            self._leaderboard_4_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_4 = self._leaderboard_4_font.render(
-                f"{self._leaderboard[3].initials} ----- {self._leaderboard[3].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 4:
-            self._leaderboard_5_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_5 = self._leaderboard_5_font.render(
-                f"{self._leaderboard[4].initials} ----- {self._leaderboard[4].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 5:
-            self._leaderboard_6_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_6 = self._leaderboard_6_font.render(
-                f"{self._leaderboard[5].initials} ----- {self._leaderboard[5].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 6:
-            self._leaderboard_7_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_7 = self._leaderboard_7_font.render(
-                f"{self._leaderboard[6].initials} ----- {self._leaderboard[6].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 7:
-            self._leaderboard_8_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_8 = self._leaderboard_8_font.render(
-                f"{self._leaderboard[7].initials} ----- {self._leaderboard[7].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 8:
-            self._leaderboard_9_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_9 = self._leaderboard_9_font.render(
-                f"{self._leaderboard[8].initials} ----- {self._leaderboard[8].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 9:
-            self._leaderboard_10_font = pygame.font.Font(
-                pygame.font.get_default_font(), 24
-                )
-            self._leaderboard_10 = self._leaderboard_10_font.render(
-                f"{self._leaderboard[9].initials} ----- {self._leaderboard[9].score}", True, rgbcolors.black
-            )
-
-        if len(self._leaderboard) > 0:
-            # Leaderboard 1
-            self._screen.blit(
-                self._leaderboard_1,
-                (
-                    200 - self._leaderboard_1.get_width() // 2,
-                    390 - self._leaderboard_1.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 1:
-            # Leaderboard 2
-            self._screen.blit(
-                self._leaderboard_2,
+        # Leaderboard rows, 30 pixels apart
+        for (i, row) in enumerate(self._rows):
+            surface.blit(
+                row,
                 (
-                    200 - self._leaderboard_2.get_width() // 2,
-                    420 - self._leaderboard_2.get_height() // 2,
+                    200 - row.get_width() // 2,
+                    390 + 30 * i - row.get_height() // 2,
                 )
             )
 
-        if len(self._leaderboard) > 2:
-            # Leaderboard 3
-            self._screen.blit(
-                self._leaderboard_3,
-                (
-                    200 - self._leaderboard_3.get_width() // 2,
-                    450 - self._leaderboard_3.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 3:
-            # Leaderboard 4
-            self._screen.blit(
-                self._leaderboard_4,
-                (
-                    200 - self._leaderboard_4.get_width() // 2,
-                    480 - self._leaderboard_4.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 4:
-            # Leaderboard 5
-            self._screen.blit(
-                self._leaderboard_5,
-                (
-                    200 - self._leaderboard_5.get_width() // 2,
-                    510 - self._leaderboard_5.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 5:
-            # Leaderboard 6
-            self._screen.blit(
-                self._leaderboard_6,
-                (
-                    200 - self._leaderboard_6.get_width() // 2,
-                    540 - self._leaderboard_6.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 6:
-            # Leaderboard 7
-            self._screen.blit(
-                self._leaderboard_7,
-                (
-                    200 - self._leaderboard_7.get_width() // 2,
-                    570 - self._leaderboard_7.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 7:
-            # Leaderboard 8
-            self._screen.blit(
-                self._leaderboard_8,
-                (
-                    200 - self._leaderboard_8.get_width() // 2,
-                    600 - self._leaderboard_8.get_height() // 2,
-                )
-            )
-
-        if len(self._leaderboard) > 8:
-            # Leaderboard 9
-            self._screen.blit(
-                self._leaderboard_9,
-                (
-                    200 - self._leaderboard_9.get_width() // 2,
-                    630 - self._leaderboard_9.get_height() // 2,
-                )
-            )
+    def draw(self):
+        """Draw the scene."""
+        super().draw()
 
-        if len(self._leaderboard) > 9:
-            # Leaderboard 10
-            self._screen.blit(
-                self._leaderboard_10,
-                (
-                    200 - self._leaderboard_10.get_width() // 2,
-                    660 - self._leaderboard_10.get_height() // 2,
-                )
+        # Initials "__ __ __", rendered again only when they change
+        self._initials = fonts.render(
+            self._initials_text_font, self._initials_text, True, rgbcolors.black
             )
+        initials_rect = self._screen.blit(
+            self._initials,
+            (
+                600 - self._initials.get_width() // 2,
+                440 - self._initials.get_height() // 2,
+            ),
+        )
+        self.mark((initials_rect,))
 
     def end_scene(self):
         """End the scene"""
         super().end_scene()
+        leaderboard.store.flush()
         self._is_valid = True
 
     def process_event(self, event):
         """Process Keyboard events."""
 
-        with open(pickle_file, "wb") as opened:
-            pickle.dump(self._leaderboard, opened, pickle.HIGHEST_PROTOCOL)
-        
         if event.type == pygame.KEYDOWN and event.key == pygame.K_SLASH:
             self._scene_manager.set_next_scene(self._next_key)
             self._is_valid = False
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and len(self._initials_text) == 1:
             self._initials_text += "__"
-            new_score = Score(self._score, self._initials_text)
-            self._leaderboard.append(new_score)
-            with open(pickle_file, "wb") as opened:
-                pickle.dump(self._leaderboard, opened, pickle.HIGHEST_PROTOCOL)
+            new_score = Score(
+                self._score, self._initials_text, stage=self._scene_manager._stage
+            )
+            leaderboard.store.add(new_score)
+            leaderboard.store.flush()
             self._scene_manager.set_next_scene(self._next_key)
             self._is_valid = False
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and len(self._initials_text) == 2:
             self._initials_text += "_"
-            new_score = Score(self._score, self._initials_text)
-            self._leaderboard.append(new_score)
-            with open(pickle_file, "wb") as opened:
-                pickle.dump(self._leaderboard, opened, pickle.HIGHEST_PROTOCOL)
+            new_score = Score(
+                self._score, self._initials_text, stage=self._scene_manager._stage
+            )
+            leaderboard.store.add(new_score)
+            leaderboard.store.flush()
             self._scene_manager.set_next_scene(self._next_key)
             self._is_valid = False
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and len(self._initials_text) == 3:
-            new_score = Score(self._score, self._initials_text)
-            self._leaderboard.append(new_score)
-            with open(pickle_file, "wb") as opened:
-                pickle.dump(self._leaderboard, opened, pickle.HIGHEST_PROTOCOL)
+            new_score = Score(
+                self._score, self._initials_text, stage=self._scene_manager._stage
+            )
+            leaderboard.store.add(new_score)
+            leaderboard.store.flush()
             self._scene_manager.set_next_scene(self._next_key)
             self._is_valid = False
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE and len(self._initials_text) <= 3 and len(self._initials_text) >= 1:
@@ -1872,9 +1653,9 @@ class EnterInitialsScene(Scene):
 
     def render_updates(self):
         """Render updates"""
-        if self._render_updates:
+        if self._render_updates is not None:
             super().render_updates()
             # if self._render_updates:
-            self._render_updates.clear(self._screen, self._background)
+            self._render_updates.clear(self._screen, self.static_layer)
             self._render_updates.update()
-            dirty = self._render_updates.draw(self._screen)
\ No newline at end of file
+            self.touch(self._render_updates.draw(self._screen))
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Darren Cruz
+# CPSC 386-02
+# 2023-04-19
+# darrencruz@csu.fullerton.edu
+# @darrenjcruz
+#
+# Lab 05-00
+#
+# This is the spatial module that contains the collision broadphase.
+#
+
+
+"""A uniform grid for finding overlapping boxes without testing them all."""
+
+import numpy as np
+
+
+def _cells(boxes, cell_size):
+    """
+    Return the key of every grid cell each box overlaps and the index of
+    the box it belongs to, as two flat arrays. No box is wider or taller
+    than a cell, so each overlaps at most two cells across and two down.
+    """
+    left = np.floor(boxes[:, 0] / cell_size)
+    top = np.floor(boxes[:, 1] / cell_size)
+    right = np.floor((np.ceil(boxes[:, 2]) - 1) / cell_size)
+    bottom = np.floor((np.ceil(boxes[:, 3]) - 1) / cell_size)
+    # Columns and rows are packed into one float key; both stay far below
+    # the 2 ** 26 that keeps the packing exact.
+    (across, down) = (right > left, bottom > top)
+    keys = np.concatenate(
+        (
+            left * 2**26 + top,
+            (right * 2**26 + top)[across],
+            (left * 2**26 + bottom)[down],
+            (right * 2**26 + bottom)[across & down],
+        )
+    )
+    owners = np.arange(len(boxes))
+    owners = np.concatenate(
+        (owners, owners[across], owners[down], owners[across & down])
+    )
+    return keys, owners
+
+
+def overlaps(first, second):
+    """
+    Return the pairs (i, j), as two arrays sorted by i and then j, where
+    box i of first overlaps box j of second. Boxes are rows of (left, top,
+    right, bottom). The grid's cells are as large as the largest box, and
+    only boxes that share a cell are tested, so the cost grows with the
+    number of boxes rather than with their product.
+    """
+    empty = np.zeros(0, dtype=np.intp)
+    if not len(first) or not len(second):
+        return empty, empty
+    sides = np.concatenate(
+        (first[:, 2:] - first[:, :2], second[:, 2:] - second[:, :2])
+    )
+    cell_size = max(np.ceil(sides.max()), 1)
+    (first_keys, first_owners) = _cells(first, cell_size)
+    (second_keys, second_owners) = _cells(second, cell_size)
+    # The cells of the smaller set are sorted and those of the larger set
+    # looked up in them.
+    swapped = len(first_keys) < len(second_keys)
+    if swapped:
+        (first_keys, first_owners, second_keys, second_owners) = (
+            second_keys, second_owners, first_keys, first_owners
+        )
+    order = np.argsort(second_keys, kind="stable")
+    (second_keys, second_owners) = (second_keys[order], second_owners[order])
+    starts = np.searchsorted(second_keys, first_keys, "left")
+    counts = np.searchsorted(second_keys, first_keys, "right") - starts
+    total = counts.sum()
+    if not total:
+        return empty, empty
+    # Pair every cell of one set with every box of the other in that cell.
+    steps = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    i = np.repeat(first_owners, counts)
+    j = second_owners[np.repeat(starts, counts) + steps]
+    if swapped:
+        (i, j) = (j, i)
+    # Boxes sharing several cells are paired once.
+    pairs = np.unique(i * len(second) + j)
+    (i, j) = (pairs // len(second), pairs % len(second))
+    (a, b) = (first[i], second[j])
+    hit = (a[:, 0] < b[:, 2]) & (a[:, 2] > b[:, 0]) & (a[:, 1] < b[:, 3]) & (a[:, 3] > b[:, 1])
+    return i[hit], j[hit]